@@ -16,11 +16,19 @@ __version__ = ".".join(map(str, bl_info.get("version", (0, 0, 0))))
 
 import bpy
 import json
+import numpy as np
+import mathutils
 import urllib.request
 import urllib.error
 from bpy.types import Operator, Panel, PropertyGroup, UIList, AddonPreferences
+from bpy.app.handlers import persistent
 import os, sys, re
+import fnmatch
 import time
+import itertools
+import bisect
+import zlib
+from collections import OrderedDict
 from bpy.props import (
     BoolProperty,
     StringProperty,
@@ -157,44 +165,554 @@ def _elide(text: str, max_len: int = 14) -> str:
     return text if len(text) <= max_len else (text[:max_len - 1] + "…")
 
 
-def _sko_split_keyblock_half(obj, src_key, axis='X', eps=1e-4, keep_side='LEFT', use_median_plane=False):
+def _kb_read_co(kb):
+    """Bulk-read a key block's coordinates into a flat float32 array (x0, y0, z0, x1, ...)."""
+    co = np.empty(len(kb.data) * 3, dtype=np.float32)
+    kb.data.foreach_get("co", co)
+    return co
+
+
+def _kb_write_co(kb, co):
+    """Bulk-write a flat coordinate array into a key block and tag the Key for redraw."""
+    kb.data.foreach_set("co", co)
+    try:
+        kb.id_data.update_tag()
+    except Exception:
+        pass
+
+
+# Data derived from a mesh's topology and Basis (median planes, mirror maps,
+# split weights, ...), keyed on (mesh pointer, topology fingerprint, Basis
+# checksum, tag, params). Least recently used entries are evicted once the
+# total size passes the "Topology Cache" limit in the add-on preferences.
+_TOPO_CACHE = OrderedDict()          # key -> (value, nbytes)
+_TOPO_STATS = {"hits": 0, "misses": 0, "bytes": 0}
+_TOPO_FINGERPRINTS = {}              # mesh pointer -> fingerprint, until its geometry changes
+
+
+def _sko_topo_fingerprint(me):
+    """(vertex, edge, face counts, CRC of the edge index array), memoized per mesh."""
+    ptr = me.as_pointer()
+    fp = _TOPO_FINGERPRINTS.get(ptr)
+    if fp is None:
+        edges = np.empty(len(me.edges) * 2, dtype=np.int32)
+        me.edges.foreach_get("vertices", edges)
+        fp = (len(me.vertices), len(me.edges), len(me.polygons), zlib.crc32(edges))
+        _TOPO_FINGERPRINTS[ptr] = fp
+        # Entries built for an older topology of this mesh can never hit again.
+        for key in [k for k in _TOPO_CACHE if k[0] == ptr and k[1] != fp]:
+            _TOPO_STATS["bytes"] -= _TOPO_CACHE.pop(key)[1]
+    return fp
+
+
+def _sko_topo_key(obj, basis_co, *tag):
+    me = obj.data
+    return (me.as_pointer(), _sko_topo_fingerprint(me), zlib.crc32(basis_co), tag)
+
+
+def _topo_cache_limit():
+    try:
+        entry = bpy.context.preferences.addons.get(_ADDON_ID)
+        return int(entry.preferences.cache_size_mb) * 1024 * 1024
+    except Exception:
+        return 64 * 1024 * 1024
+
+
+def _topo_nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_topo_nbytes(v) for v in value) + 8 * len(value)
+    return 8
+
+
+def _topo_cache_get(key):
+    hit = _TOPO_CACHE.get(key)
+    if hit is None:
+        _TOPO_STATS["misses"] += 1
+        return None
+    _TOPO_STATS["hits"] += 1
+    _TOPO_CACHE.move_to_end(key)
+    return hit[0]
+
+
+def _topo_cache_put(key, value):
+    nbytes = _topo_nbytes(value)
+    old = _TOPO_CACHE.pop(key, None)
+    if old is not None:
+        _TOPO_STATS["bytes"] -= old[1]
+    _TOPO_CACHE[key] = (value, nbytes)
+    _TOPO_STATS["bytes"] += nbytes
+    limit = _topo_cache_limit()
+    # Always keep the entry just added, even if it alone is over the limit.
+    while _TOPO_STATS["bytes"] > limit and len(_TOPO_CACHE) > 1:
+        _k, (_v, n) = _TOPO_CACHE.popitem(last=False)
+        _TOPO_STATS["bytes"] -= n
+    return value
+
+
+def _topo_cache_invalidate(mesh_ptr=None):
+    """Drop cached entries for one mesh (all meshes when mesh_ptr is None)."""
+    if mesh_ptr is None:
+        _TOPO_CACHE.clear()
+        _TOPO_FINGERPRINTS.clear()
+        _TOPO_STATS["bytes"] = 0
+        return
+    _TOPO_FINGERPRINTS.pop(mesh_ptr, None)
+    for key in [k for k in _TOPO_CACHE if k[0] == mesh_ptr]:
+        _TOPO_STATS["bytes"] -= _TOPO_CACHE.pop(key)[1]
+
+
+def _topo_cache_drop_vgroups(mesh_ptr):
+    """Drop one mesh's cached vertex group weights."""
+    for key in [k for k in _TOPO_CACHE if k[0] == mesh_ptr and k[3][:1] == ("vgroup",)]:
+        _TOPO_STATS["bytes"] -= _TOPO_CACHE.pop(key)[1]
+
+
+def _np_median(values):
+    """Median of a 1-D array by linear-time selection (0.0 when empty)."""
+    n = len(values)
+    if n == 0:
+        return 0.0
+    mid = n // 2
+    if n % 2 == 1:
+        return float(np.partition(values, mid)[mid])
+    part = np.partition(values, (mid - 1, mid))
+    return float(0.5 * (part[mid - 1] + part[mid]))
+
+
+def _sko_median_plane(obj, axis='X', basis_co=None):
     """
-    Zero out the opposite half of src_key (relative to Basis), by copying Basis coords.
-    keep_side: 'LEFT' or 'RIGHT' (negative vs positive side along the X axis).
-    If use_median_plane is True, split around the median coordinate of Basis on that axis.
+    Median of the Basis coordinates along axis, found by linear-time selection
+    (np.partition) and cached until the mesh topology or the Basis changes.
     """
     sk = obj.data.shape_keys
-    if not sk or not src_key or src_key == sk.key_blocks[0]:
+    if not sk:
+        return 0.0
+    if basis_co is None:
+        basis_co = _kb_read_co(sk.key_blocks[0])
+    comp_idx = {'X': 0, 'Y': 1, 'Z': 2}.get(axis.upper(), 0)
+
+    key = _sko_topo_key(obj, basis_co, 'median', comp_idx)
+    plane = _topo_cache_get(key)
+    if plane is not None:
+        return plane
+    return _topo_cache_put(key, _np_median(basis_co[comp_idx::3].astype(np.float64)))
+
+
+def _sko_mirror_map(obj, basis_co, tolerance=0.0001):
+    """
+    X-mirror vertex correspondence of the Basis: (partner, unmatched).
+
+    partner[i] is the vertex whose -X position matches vertex i within
+    tolerance (built once with a mathutils.kdtree and cached until the mesh
+    topology or the Basis changes); unmatched is a bool mask of vertices
+    without a partner, which map to themselves.
+    """
+    key = _sko_topo_key(obj, basis_co, 'mirror', float(tolerance))
+    hit = _topo_cache_get(key)
+    if hit is not None:
+        return hit
+
+    b3 = basis_co.reshape(-1, 3)
+    count = len(b3)
+    kd = mathutils.kdtree.KDTree(count)
+    for i, co in enumerate(b3.tolist()):
+        kd.insert(co, i)
+    kd.balance()
+
+    partner = np.arange(count, dtype=np.int32)
+    unmatched = np.zeros(count, dtype=bool)
+    for i, (x, y, z) in enumerate(b3.tolist()):
+        _co, j, dist = kd.find((-x, y, z))
+        if j is None or dist > tolerance:
+            unmatched[i] = True
+        else:
+            partner[i] = j
+
+    return _topo_cache_put(key, (partner, unmatched))
+
+
+def _sko_mirror_co(co, basis_co, mirror):
+    """
+    Mirror a key across X: each vertex takes its partner's delta from Basis
+    with the X component negated. Unmatched vertices keep their own delta.
+    """
+    partner, unmatched = mirror
+    delta = (co - basis_co).reshape(-1, 3)[partner]
+    delta[:, 0] *= -1.0
+    out = basis_co.reshape(-1, 3) + delta
+    if unmatched.any():
+        out[unmatched] = co.reshape(-1, 3)[unmatched]
+    return out.reshape(-1)
+
+
+_SPLIT_AXES = {'X': 0, 'Y': 1, 'Z': 2}
+
+
+def _sko_copy_key_settings(src, dst):
+    """Copy slider range, relative key, vertex group and interpolation from src to dst."""
+    try:
+        # Set min twice so the range is accepted whatever dst's current range is.
+        dst.slider_min = float(src.slider_min)
+        dst.slider_max = float(src.slider_max)
+        dst.slider_min = float(src.slider_min)
+    except Exception:
+        pass
+    for attr in ("relative_key", "vertex_group", "interpolation"):
+        try:
+            setattr(dst, attr, getattr(src, attr))
+        except Exception:
+            pass
+
+
+def _sko_ensure_object_mode(obj):
+    """Leave Edit Mode if obj is in it (edit-mesh data would overwrite direct key writes).
+
+    Returns False if obj is still in Edit Mode afterwards (e.g. no usable context).
+    """
+    if getattr(obj, "mode", 'OBJECT') != 'EDIT':
+        return True
+    try:
+        bpy.ops.object.mode_set(mode='OBJECT')
+    except Exception:
+        pass
+    return obj.mode != 'EDIT'
+
+
+def _sko_create_keys(obj, names, coords=None, *, from_mix=False, like=None):
+    """
+    Create one shape key per entry of names through Object.shape_key_add.
+
+    Needs no operator or UI context, so it also works from timers, handlers and
+    background scripts (the object must not be in Edit Mode).
+    names: names for the new keys; an empty name gets Blender's "Key N".
+    coords: optional iterable of flat coordinate arrays, one per key (None
+    entries keep what shape_key_add produced); each is written with one foreach_set.
+    from_mix: start the keys from the current mix instead of the Basis.
+    like: optional key blocks, one per key, whose settings are copied over.
+    Adds a Basis first if obj has no shape keys. Returns the new key blocks.
+    """
+    if not getattr(obj.data, 'shape_keys', None):
+        obj.shape_key_add(name="Basis", from_mix=False)
+    ks = obj.data.shape_keys.key_blocks
+    coords = iter(coords) if coords is not None else None
+    like = list(like) if like is not None else []
+
+    new_keys = []
+    for i, name in enumerate(names):
+        new_key = obj.shape_key_add(name=name or f"Key {len(ks)}", from_mix=from_mix)
+        co = next(coords, None) if coords is not None else None
+        if co is not None:
+            _kb_write_co(new_key, co)
+        if i < len(like) and like[i] is not None:
+            _sko_copy_key_settings(like[i], new_key)
+        new_keys.append(new_key)
+    bump_generation("stack")
+    return new_keys
+
+
+class _SKOStackSnapshot:
+    """
+    value / mute / slider_min / slider_max of every key in a stack, captured with
+    one foreach_get per attribute and restored by index with foreach_set.
+
+    As a context manager it restores on exit, also when the body raises:
+
+        with _SKOStackSnapshot(obj) as snap:
+            snap.write("value", np.zeros_like(snap.value))
+            ...
+
+    Keys appended during the block keep their own settings.
+    """
+
+    _ATTRS = (("value", np.float32), ("mute", bool),
+              ("slider_min", np.float32), ("slider_max", np.float32))
+
+    def __init__(self, obj):
+        self.key_blocks = obj.data.shape_keys.key_blocks
+        self.arrays = {attr: self._read(attr, dtype) for attr, dtype in self._ATTRS}
+
+    def _read(self, attr, dtype):
+        arr = np.empty(len(self.key_blocks), dtype=dtype)
+        self.key_blocks.foreach_get(attr, arr)
+        return arr
+
+    @property
+    def value(self):
+        return self.arrays["value"]
+
+    @property
+    def mute(self):
+        return self.arrays["mute"]
+
+    def write(self, attr, arr):
+        """Set attr on the whole (current) stack from arr in one call."""
+        self.key_blocks.foreach_set(attr, np.ascontiguousarray(arr, dtype=dict(self._ATTRS)[attr]))
+
+    def restore(self):
+        count = len(self.arrays["value"])
+        current = {attr: self._read(attr, dtype) for attr, dtype in self._ATTRS}
+        if len(current["value"]) < count:
+            return False
+        for attr, arr in self.arrays.items():
+            current[attr][:count] = arr
+        # Slider setters clamp against each other: lower the minimum first so
+        # the old maximum always fits, then put the exact minimum back.
+        target_min = current["slider_min"]
+        self.write("slider_min", np.minimum(target_min, self._read("slider_min", np.float32)))
+        self.write("slider_max", current["slider_max"])
+        self.write("slider_min", target_min)
+        self.write("value", current["value"])
+        self.write("mute", current["mute"])
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.restore()
+        return False
+
+
+def _sko_key_mask(obj, keys):
+    """Bool mask over obj's key stack marking the given key blocks."""
+    ks = obj.data.shape_keys.key_blocks
+    # key_blocks.find() is a linear scan per call; map pointers once instead.
+    pos = {kb.as_pointer(): i for i, kb in enumerate(ks)}
+    mask = np.zeros(len(ks), dtype=bool)
+    idx = [i for i in (pos.get(k.as_pointer(), -1) for k in keys) if i >= 0]
+    mask[idx] = True
+    return mask
+
+
+def _sko_batch_edit(obj, mask, *, mute=None, slider_range=None, value=None):
+    """
+    Edit mute / slider range / value on the keys under mask: one foreach_get and
+    one foreach_set per touched attribute, with the change applied in NumPy.
+
+    mute: 'ON', 'OFF' or 'TOGGLE'.
+    slider_range: (min, max); values outside the new range are clamped into it.
+    value: new value for every masked key (clamped to its slider range).
+    Returns the number of keys edited.
+    """
+    ks = obj.data.shape_keys.key_blocks
+    count = int(np.count_nonzero(mask))
+    if not count:
         return 0
 
-    basis = sk.key_blocks[0]
-    kd = src_key.data
-    bd = basis.data
-    n = len(kd)
+    def read(attr, dtype):
+        arr = np.empty(len(ks), dtype=dtype)
+        ks.foreach_get(attr, arr)
+        return arr
 
-    comp_idx = {'X': 0, 'Y': 1, 'Z': 2}.get(axis.upper(), 0)
+    if mute is not None:
+        muted = read("mute", bool)
+        if mute == 'TOGGLE':
+            muted[mask] = ~muted[mask]
+        else:
+            muted[mask] = (mute == 'ON')
+        ks.foreach_set("mute", muted)
+
+    if slider_range is not None or value is not None:
+        lo = read("slider_min", np.float32)
+        hi = read("slider_max", np.float32)
+        if slider_range is not None:
+            new_lo, new_hi = lo.copy(), hi.copy()
+            new_lo[mask], new_hi[mask] = slider_range
+            # Each setter clamps against the other bound: widen the minimum
+            # first so the new maximum always fits, then set the exact minimum.
+            ks.foreach_set("slider_min", np.minimum(lo, new_lo))
+            ks.foreach_set("slider_max", new_hi)
+            ks.foreach_set("slider_min", new_lo)
+            lo, hi = new_lo, new_hi
+        values = read("value", np.float32)
+        if value is not None:
+            values[mask] = value
+        values[mask] = np.clip(values[mask], lo[mask], hi[mask])
+        ks.foreach_set("value", values)
+
+    try:
+        obj.data.shape_keys.update_tag()
+    except Exception:
+        pass
+    return count
+
+
+def _sko_vgroup_weights(obj, name):
+    """Per-vertex weights of vertex group name as a float32 array, or None if there is no such group.
+
+    There is no bulk accessor for vertex group weights, so they are read once
+    and kept in the topology cache until the mesh's geometry (which includes
+    weight painting) or the object's vertex groups change.
+    """
+    vg = obj.vertex_groups.get(name) if name else None
+    if vg is None:
+        return None
+    # Renaming, removing or re-adding groups keeps the name but moves the index.
+    key = _sko_topo_key(obj, b"", "vgroup", name, vg.index)
+    weights = _topo_cache_get(key)
+    if weights is not None:
+        return weights
+    gi = vg.index
+    weights = np.zeros(len(obj.data.vertices), dtype=np.float32)
+    for v in obj.data.vertices:
+        for g in v.groups:
+            if g.group == gi:
+                weights[v.index] = g.weight
+                break
+    return _topo_cache_put(key, weights)
+
+
+def _sko_eval_mix(obj, keys=None, values=None):
+    """
+    Evaluate obj's relative shape-key mix in memory; returns flat float32 coords.
 
-    if use_median_plane:
-        coords = [bd[i].co[comp_idx] for i in range(n)]
-        coords.sort()
-        mid = len(coords) // 2
-        plane = (coords[mid] if (len(coords) % 2 == 1) else 0.5 * (coords[mid - 1] + coords[mid]))
+    keys: key blocks to include (default: every non-Basis key).
+    values: optional name -> value overrides (default: each key's current value).
+    Accumulates value * weight * (key - relative_key) on top of the Basis,
+    honoring mute, vertex_group and relative_key like Blender's own mix.
+    Key values are only read, never written.
+    """
+    ks = obj.data.shape_keys.key_blocks
+    basis = ks[0]
+    coords = {}
+
+    def co_of(kb):
+        ptr = kb.as_pointer()
+        arr = coords.get(ptr)
+        if arr is None:
+            arr = coords[ptr] = _kb_read_co(kb)
+        return arr
+
+    out = co_of(basis).astype(np.float64)
+    for kb in (ks[1:] if keys is None else keys):
+        if kb == basis or kb.mute:
+            continue
+        value = float(values.get(kb.name, kb.value) if values else kb.value)
+        if value == 0.0:
+            continue
+        ref = kb.relative_key or basis
+        if ref == kb:
+            continue
+        delta = (co_of(kb) - co_of(ref)).astype(np.float64) * value
+        weights = _sko_vgroup_weights(obj, kb.vertex_group)
+        if weights is not None:
+            delta = (delta.reshape(-1, 3) * weights[:, None]).ravel()
+        out += delta
+    return out.astype(np.float32)
+
+
+def _sko_remove_keys(obj, keys):
+    """
+    Remove key blocks in one pass through Object.shape_key_remove (never the Basis).
+
+    Keys whose relative_key pointed at a removed key are re-pointed at the nearest
+    surviving key up that relative chain (or the Basis). The removed keys' state
+    items are pruned by key ID from this Key datablock's own collection; other
+    Keys are never touched. Returns the names the removed keys had.
+    """
+    sk = obj.data.shape_keys
+    ks = sk.key_blocks
+    basis = ks[0]
+    doomed = {kb.as_pointer(): kb for kb in keys if kb and kb != basis}
+    if not doomed:
+        return []
+
+    for kb in ks:
+        if kb.as_pointer() in doomed:
+            continue
+        ref = kb.relative_key
+        if not ref or ref.as_pointer() not in doomed:
+            continue
+        for _ in range(len(ks)):
+            ref = ref.relative_key
+            if not ref or ref.as_pointer() not in doomed:
+                break
+        kb.relative_key = ref if (ref and ref.as_pointer() not in doomed) else basis
+
+    active = obj.active_shape_key
+    keep_active = active if (active and active.as_pointer() not in doomed) else None
+    old_index = obj.active_shape_key_index
+
+    names = [kb.name for kb in doomed.values()]
+    ids = [key_id(kb) for kb in doomed.values()]
+    for kb in doomed.values():
+        obj.shape_key_remove(kb)
+
+    ks = sk.key_blocks
+    if keep_active is not None:
+        obj.active_shape_key_index = ks.find(keep_active.name)
     else:
-        plane = 0.0
+        obj.active_shape_key_index = max(0, min(old_index, len(ks) - 1))
 
-    changed = 0
-    for i in range(n):
-        v = bd[i].co[comp_idx] - plane
-        if keep_side == 'LEFT':
-            kill = (v > eps)
-        else:
-            kill = (v < -eps)
+    remove_items(sk, ids)
+    bump_generation("stack")
+    # Reconcile now, before a new key block can reuse a freed pointer.
+    _stack_entry(sk)
+    return names
 
-        if kill:
-            kd[i].co = bd[i].co
-            changed += 1
 
-    return changed
+def _sko_split_weights(obj, basis_co, axis='X', eps=1e-4, falloff='NONE', band=0.0,
+                       use_median_plane=False, plane_co=(0.0, 0.0, 0.0), plane_no=(1.0, 0.0, 0.0)):
+    """
+    Per-vertex (left, right) weights for splitting keys of obj, as float32 arrays.
+
+    axis: 'X', 'Y', 'Z' (plane through the origin) or 'PLANE' (plane_co / plane_no).
+    The left side is the negative side of the plane.
+    falloff 'NONE' is a hard cut: vertices within eps of the plane keep the full
+    delta on both sides. 'LINEAR' / 'SMOOTH' blend across a band of width band
+    centred on the plane, and the two weights always sum to 1.
+    """
+    axis = axis.upper()
+    tag = ('split', axis, float(eps), falloff, float(band), bool(use_median_plane))
+    if axis == 'PLANE':
+        tag += (tuple(map(float, plane_co)), tuple(map(float, plane_no)))
+    key = _sko_topo_key(obj, basis_co, *tag)
+    hit = _topo_cache_get(key)
+    if hit is not None:
+        return hit
+
+    pts = basis_co.reshape(-1, 3).astype(np.float64)
+    if axis in _SPLIT_AXES:
+        d = pts[:, _SPLIT_AXES[axis]]
+        if use_median_plane:
+            d = d - _sko_median_plane(obj, axis, basis_co)
+    else:
+        normal = np.asarray(plane_no, dtype=np.float64)
+        length = np.linalg.norm(normal)
+        normal = normal / length if length > 0.0 else np.array([1.0, 0.0, 0.0])
+        d = (pts - np.asarray(plane_co, dtype=np.float64)) @ normal
+        if use_median_plane:
+            d = d - _np_median(d)
+
+    if falloff == 'NONE' or band <= 0.0:
+        w_left = (d <= eps).astype(np.float32)
+        w_right = (d >= -eps).astype(np.float32)
+    else:
+        t = np.clip((d + 0.5 * band) / band, 0.0, 1.0)
+        if falloff == 'SMOOTH':
+            t = t * t * (3.0 - 2.0 * t)
+        w_right = t.astype(np.float32)
+        w_left = (1.0 - t).astype(np.float32)
+
+    return _topo_cache_put(key, (w_left, w_right))
+
+
+def _sko_weighted_delta(co, ref_co, weights):
+    """
+    Return (new co, changed): co with its delta from ref_co scaled per vertex by
+    weights (0 = ref, 1 = unchanged), and the number of vertices scaled down.
+    co is not modified.
+    """
+    scaled = weights < 1.0
+    changed = int(np.count_nonzero(scaled))
+    out = co.copy()
+    if changed:
+        o3 = out.reshape(-1, 3)
+        r3 = ref_co.reshape(-1, 3)[scaled]
+        o3[scaled] = r3 + (o3[scaled] - r3) * weights[scaled][:, None]
+    return out, changed
 
 
 def get_target_keys(context, *, require_selected=True, visible_only=True,
@@ -268,12 +786,41 @@ class SKO_AddonPreferences(AddonPreferences):
         default=False,
     )
 
+    cache_size_mb: IntProperty(
+        name="Topology Cache (MB)",
+        description="Memory limit for cached mirror maps, split weights and other per-mesh data",
+        default=64, min=1, soft_max=1024,
+    )
+
     def draw(self, context):
         col = self.layout.column(align=True)
         row = col.row(align=True)
         row.prop(self, "auto_check")
         row.operator("shapekey_organizer.check_updates", icon='FILE_REFRESH')
 
+        col = self.layout.column(align=True)
+        row = col.row(align=True)
+        row.prop(self, "cache_size_mb")
+        row.operator("shapekey_organizer.clear_topology_cache", text="", icon='TRASH')
+        col.label(text=(
+            f"{len(_TOPO_CACHE)} entries, {_TOPO_STATS['bytes'] / (1024 * 1024):.1f} MB  |  "
+            f"hits {_TOPO_STATS['hits']}, misses {_TOPO_STATS['misses']}"
+        ))
+
+
+class SKO_OT_ClearTopologyCache(bpy.types.Operator):
+    bl_idname = "shapekey_organizer.clear_topology_cache"
+    bl_label = "Clear Topology Cache"
+    bl_description = "Free cached per-mesh data (mirror maps, split weights, ...) and reset the hit/miss counters"
+    bl_options = {'INTERNAL'}
+
+    def execute(self, context):
+        freed = _TOPO_STATS["bytes"]
+        _topo_cache_invalidate()
+        _TOPO_STATS["hits"] = _TOPO_STATS["misses"] = 0
+        self.report({'INFO'}, f"Freed {freed / (1024 * 1024):.1f} MB of cached mesh data.")
+        return {'FINISHED'}
+
 
 def _sko_auto_check(_dummy):
     try:
@@ -291,28 +838,173 @@ def _sko_auto_check(_dummy):
             pass
 
 
+@persistent
+def _sko_invalidate_caches(_dummy):
+    """Undo/redo and file loads swap the underlying data; drop every cached index."""
+    bump_generation()
+    _FILTER_CACHE.clear()
+    _STACKS.clear()
+    _SEL_CACHE.clear()
+    _GROUP_SNAPSHOT.clear()
+    _GROUP_INDEX.clear()
+    _GROUP_TREE.clear()
+    _SEARCH_INDEX.clear()
+    _FIND_LAST.clear()
+    _topo_cache_invalidate()
+
+
+@persistent
+def _sko_on_depsgraph_update(_scene, depsgraph):
+    """
+    Key datablock edits (renames, reorders from Blender's own UI) invalidate filter
+    results; mesh geometry edits invalidate that mesh's topology cache entries.
+    """
+    stack_changed = False
+    for update in depsgraph.updates:
+        id_data = update.id
+        if isinstance(id_data, bpy.types.Key):
+            stack_changed = True
+        elif isinstance(id_data, bpy.types.Object) and id_data.type == 'MESH':
+            # Blender's own Add/Remove/Move Shape Key tag the object, not the Key.
+            me = id_data.original.data
+            if getattr(me, 'shape_keys', None) is not None:
+                stack_changed = True
+            # Vertex group renames, additions and removals tag the object too.
+            _topo_cache_drop_vgroups(me.as_pointer())
+        elif isinstance(id_data, bpy.types.Mesh) and update.is_updated_geometry:
+            if id_data.original.shape_keys is not None:
+                stack_changed = True
+            # Slider drags report geometry updates too, so evict right away only
+            # when the element counts changed; otherwise just forget the memoized
+            # fingerprint and let the next lookup re-hash the edges.
+            me = id_data.original
+            ptr = me.as_pointer()
+            _TOPO_FINGERPRINTS.pop(ptr, None)
+            counts = (len(me.vertices), len(me.edges), len(me.polygons))
+            if any(k[0] == ptr and k[1][:3] != counts for k in _TOPO_CACHE):
+                _topo_cache_invalidate(ptr)
+            else:
+                # Vertex weights may have been painted.
+                _topo_cache_drop_vgroups(ptr)
+    if stack_changed:
+        bump_generation("stack")
+
+
+@persistent
+def _sko_on_save_pre(_dummy):
+    """Write key IDs that could not be stored at the time (e.g. assigned during a
+    redraw) and sweep stale state items out of every Key before saving."""
+    # Linked, overridden or otherwise read-only data rejects the RNA/ID-property
+    # writes; skip it. Anything else is a bug and should surface.
+    try:
+        migrate_scene_items()
+    except (AttributeError, RuntimeError, TypeError) as e:
+        print(f"Shapekey Add-Ons: could not migrate scene state on save: {e}")
+    removed, reclaimed = 0, 0
+    for sk in bpy.data.shape_keys:
+        if sk.library is not None:
+            continue
+        try:
+            _stack_flush(sk)
+            r, b = sweep_state_items(sk)
+        except (AttributeError, RuntimeError, TypeError) as e:
+            print(f"Shapekey Add-Ons: could not sweep state of '{sk.name}' on save: {e}")
+            continue
+        removed += r
+        reclaimed += b
+    if removed:
+        print(f"Shapekey Add-Ons: removed {removed} stale state entries on save (~{reclaimed / 1024:.1f} KB).")
+
+
+@persistent
+def _sko_migrate_on_load(_dummy=None):
+    """Move state out of the old scene-wide collection once a file is loaded."""
+    try:
+        migrate_scene_items()
+    except Exception:
+        pass
+    return None
+
+
+_SKO_CACHE_HANDLERS = (
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+    bpy.app.handlers.load_post,
+)
+
+
+# The Find field selects matching keys. Edits are debounced: the update hook
+# only records the target and (re)arms a timer, and the selection is updated
+# once typing pauses. Only keys whose match state changed since the last Find
+# are touched, in one batch write of the selection bitmap.
+_FIND_DEBOUNCE = 0.15                 # seconds
+_FIND_PENDING = {}                    # "scene", "object" names of the pending Find
+_FIND_LAST = {}                       # Key pointer -> (needle, case, key IDs matched)
+
 
 def _on_find_change(self, context):
-    """When the Find field changes, auto-select keys whose names contain it.
-    Respects the case sensitivity toggle (default: case-insensitive)."""
+    """Schedule a Find selection update for the active object."""
     try:
         obj = active_obj_mesh(context)
         if not obj:
             return
-        needle = self.find
-        if not needle:
-            return
-        case_sensitive = getattr(self, 'find_case_sensitive', False)
-        if not case_sensitive:
-            needle_cmp = needle.lower()
-        for k in iter_keyblocks(obj):
-            hay = k.name if case_sensitive else k.name.lower()
-            if (needle if case_sensitive else needle_cmp) in hay:
-                set_sel(k, True)
+        _FIND_PENDING["scene"] = context.scene.name
+        _FIND_PENDING["object"] = obj.name
+        if bpy.app.timers.is_registered(_sko_apply_find):
+            bpy.app.timers.unregister(_sko_apply_find)
+        bpy.app.timers.register(_sko_apply_find, first_interval=_FIND_DEBOUNCE)
     except Exception:
         pass
 
 
+def _sko_apply_find():
+    """Timer callback: select keys matching Find and deselect the ones that stopped matching."""
+    try:
+        scene = bpy.data.scenes.get(_FIND_PENDING.pop("scene", ""))
+        obj = bpy.data.objects.get(_FIND_PENDING.pop("object", ""))
+        sk = getattr(getattr(obj, 'data', None), 'shape_keys', None)
+        props = getattr(scene, 'shapekey_organizer', None)
+        if sk is None or props is None or sk.library is not None:
+            return None
+        apply_find(sk, props.find, props.find_case_sensitive)
+        for win in bpy.context.window_manager.windows:
+            for area in win.screen.areas:
+                if area.type in {'PROPERTIES', 'VIEW_3D'}:
+                    area.tag_redraw()
+    except Exception:
+        pass
+    return None
+
+
+def apply_find(sk, needle: str, case_sensitive: bool = False):
+    """Update the selection of sk for the Find text; returns (selected, deselected) counts.
+
+    Keys that start matching are selected and keys that matched the previous
+    Find but no longer do are deselected; everything else keeps its state.
+    An empty needle leaves the selection alone and forgets the previous Find.
+    """
+    ptr = sk.as_pointer()
+    if not needle:
+        _FIND_LAST.pop(ptr, None)
+        return 0, 0
+    stack = _stack_entry(sk)
+    ids = stack["ids"]
+    matched = frozenset(ids[i] for i in search_indices(sk, needle, 'SUBSTRING', case_sensitive, slot="find"))
+    previous = _FIND_LAST.get(ptr, (None, None, frozenset()))[2]
+    _FIND_LAST[ptr] = (needle, case_sensitive, matched)
+
+    pos = stack["pos"]
+    added = [pos[kid] for kid in matched - previous]
+    dropped = [pos[kid] for kid in previous - matched if kid in pos]
+    if not added and not dropped:
+        return 0, 0
+    mask = selection_mask(sk).copy()
+    mask[added] = True
+    mask[dropped] = False
+    set_selection_mask(sk, mask)
+    return len(added), len(dropped)
+
+
 def active_obj_mesh(context):
     obj = context.object
     return obj if (obj and obj.type == 'MESH') else None
@@ -325,62 +1017,818 @@ def iter_keyblocks(obj):
 
 class SKO_Item(PropertyGroup):
     key_name: StringProperty(name="Key Name")
+    key_id: IntProperty(name="Key ID", description="Persistent ID of the key block within its Key datablock")
+    # Legacy scene-wide storage only: the Key datablock an item belongs to (0 key_id = match by name).
+    owner: StringProperty(name="Owner", description="Key datablock the key block belongs to")
+    # Legacy: selection now lives in a bitmap on the Key datablock; only read once to migrate.
     selected: BoolProperty(name="Selected", description="Selection state for list actions")
     group: StringProperty(name="Group", description="Optional group tag for this shapekey")
+    tags: StringProperty(name="Tags", description="Further group tags of this shapekey, one per line")
+
+
+def _on_group_list_change(self, context):
+    bump_generation("group_list")
 
 
 class SKO_GroupItem(PropertyGroup):
-    name: StringProperty(name="Group Name", description="Custom group tag")
+    name: StringProperty(
+        name="Group Name",
+        description="Custom group tag; use slashes for nested groups (Face/Mouth/Lips)",
+        update=_on_group_list_change,
+    )
+    expanded: BoolProperty(
+        name="Expanded",
+        description="Show the groups nested under this one",
+        default=True,
+        update=_on_group_list_change,
+    )
+
+
+def _state_items(sk):
+    """State collection of a Key datablock (one SKO_Item per key block with state)."""
+    return getattr(sk, 'sko_items', None)
+
+
+# Generation counters. "items" is bumped whenever a state collection may have
+# changed behind the helpers below (undo/redo, file load); "state" whenever a
+# selection or group value is written; "group" when a group tag changes;
+# "stack" when key blocks are added, removed, renamed or reordered;
+# "group_list" when the scene's group list or its tree state changes.
+_GEN = {"items": 0, "state": 0, "group": 0, "stack": 0, "group_list": 0}
+
+# key id -> index maps for state collections, keyed by the owning Key pointer.
+_ITEM_INDEX = {}
+
 
+def bump_generation(*names):
+    """Invalidate caches tied to the given generation counters (all if none given)."""
+    for n in (names or tuple(_GEN)):
+        _GEN[n] = _GEN.get(n, 0) + 1
 
-def _state_items():
-    scn = bpy.context.scene
-    return getattr(scn, 'sko_items', None)
+
+# =====================================================
+# Key identity
+# =====================================================
+# Every key block gets an integer ID, unique within its Key datablock, so state
+# follows a key through renames and reorders. IDs are stored on the Key itself:
+# "sko_ids" (aligned with key_blocks), "sko_id_names" (the names they were
+# written for) and "sko_next_id". Within a session key blocks are matched by
+# pointer; after undo or reload by name, or by position for a key renamed in place.
+_STACKS = {}   # Key pointer -> {"gen", "ptrs", "names", "ids", "pos", "name_pos", "next", "dirty"}
 
 
-def find_item_by_name(name: str):
-    items = _state_items()
+def _stack_store(sk, entry):
+    if not entry["ids"]:
+        return
+    try:
+        # Assign lists: Blender writes a buffer into an existing array property
+        # without resizing it first.
+        sk["sko_ids"] = list(entry["ids"])
+        sk["sko_id_names"] = "\n".join(entry["names"])
+        sk["sko_next_id"] = entry["next"]
+        entry["dirty"] = False
+    except Exception:
+        # Draw callbacks and linked data can't write ID properties; retry on the next write.
+        pass
+
+
+# Every reconciled stack that differs from the previous one gets a fresh
+# version; caches derived from names/order key on it instead of the "stack"
+# generation, which also moves on every slider drag.
+_STACK_VERSIONS = itertools.count(1)
+
+
+def _stack_entry(sk):
+    """Return the identity entry of a Key datablock, reconciled with its current stack."""
+    ptr = sk.as_pointer()
+    entry = _STACKS.get(ptr)
+    if entry is not None and entry["gen"] == _GEN["stack"]:
+        return entry
+
+    kbs = sk.key_blocks
+    ptrs = tuple(kb.as_pointer() for kb in kbs)
+    names = tuple(kb.name for kb in kbs)
+    if entry is not None and entry["ptrs"] == ptrs and entry["names"] == names:
+        entry["gen"] = _GEN["stack"]
+        return entry
+
+    if entry is None:
+        old_ids, old_names = (), ()
+        stored, stored_names = sk.get("sko_ids"), sk.get("sko_id_names")
+        if stored is not None and isinstance(stored_names, str):
+            old_ids = tuple(int(i) for i in stored)
+            old_names = tuple(stored_names.split("\n")) if stored_names else ()
+            if len(old_ids) != len(old_names):
+                old_ids, old_names = (), ()
+        by_ptr = {}
+        next_id = max(int(sk.get("sko_next_id", 0)), max(old_ids, default=0))
+    else:
+        old_ids, old_names = entry["ids"], entry["names"]
+        by_ptr = dict(zip(entry["ptrs"], old_ids))
+        next_id = entry["next"]
+
+    by_name = dict(zip(old_names, old_ids))
+    renamed_in_place = len(old_names) == len(names)
+    name_set = set(names)
+    ids, used = [], set()
+    for j, (p, n) in enumerate(zip(ptrs, names)):
+        kid = by_ptr.get(p)
+        if kid is None:
+            kid = by_name.get(n)
+        if kid is None and renamed_in_place and old_names[j] not in name_set:
+            kid = old_ids[j]
+        if kid is None or kid in used:
+            next_id += 1
+            kid = next_id
+        used.add(kid)
+        ids.append(kid)
+
+    ids = tuple(ids)
+    entry = {
+        "gen": _GEN["stack"],
+        "version": next(_STACK_VERSIONS),
+        "ptrs": ptrs,
+        "names": names,
+        "ids": ids,
+        "pos": {kid: j for j, kid in enumerate(ids)},
+        "name_pos": {n: j for j, n in enumerate(names)},
+        "next": next_id,
+        "dirty": ids != old_ids or names != old_names,
+    }
+    _STACKS[ptr] = entry
+    if entry["dirty"]:
+        _stack_store(sk, entry)
+    return entry
+
+
+def _stack_flush(sk):
+    entry = _STACKS.get(sk.as_pointer())
+    if entry is not None and entry["dirty"]:
+        _stack_store(sk, entry)
+
+
+def key_id(key):
+    """Persistent ID of a key block (0 if it is not part of its Key's stack)."""
+    entry = _stack_entry(key.id_data)
+    j = entry["name_pos"].get(key.name, -1)
+    return entry["ids"][j] if j >= 0 else 0
+
+
+def _item_index(items):
+    """Return the index entry for items, rebuilding it if its length or generation is stale."""
+    try:
+        owner = items.id_data.as_pointer()
+    except Exception:
+        owner = 0
+    n = len(items)
+    entry = _ITEM_INDEX.get(owner)
+    if entry is None or entry["len"] != n or entry["gen"] != _GEN["items"]:
+        mapping = {}
+        for i, it in enumerate(items):
+            mapping.setdefault(it.key_id, i)
+        entry = {"len": n, "gen": _GEN["items"], "ids": mapping}
+        _ITEM_INDEX[owner] = entry
+    return entry
+
+
+def _item_lookup(items, kid: int):
+    """Return (index, item) for kid, or (-1, None)."""
+    idx = _item_index(items)["ids"].get(kid, -1)
+    if idx < 0:
+        return -1, None
+    it = items[idx]
+    if it.key_id != kid:
+        # Edited outside the helpers (e.g. from the Python console): rebuild once.
+        bump_generation("items")
+        idx = _item_index(items)["ids"].get(kid, -1)
+        if idx < 0:
+            return -1, None
+        it = items[idx]
+    return idx, it
+
+
+def find_item(key):
+    """Return the state item of a key block, or None."""
+    items = _state_items(key.id_data)
     if not items:
         return None
-    for it in items:
-        if it.key_name == name:
-            return it
-    return None
+    return _item_lookup(items, key_id(key))[1]
 
 
-def ensure_item_by_name(name: str, create: bool = False):
-    """Return state item for name. Only create when create=True (never from draw)."""
-    items = _state_items()
+def ensure_item(key, create: bool = False):
+    """Return the state item of key. Only create when create=True (never from draw)."""
+    return _ensure_item_id(key.id_data, key_id(key), key.name, create)
+
+
+def _ensure_item_id(sk, kid: int, name: str, create: bool = False):
+    items = _state_items(sk)
     if items is None:
         return None
-    it = find_item_by_name(name)
+    it = _item_lookup(items, kid)[1]
     if it or not create:
         return it
+    entry = _item_index(items)
     it = items.add()
     it.key_name = name
+    it.key_id = kid
+    entry["ids"].setdefault(kid, len(items) - 1)
+    entry["len"] = len(items)
+    _stack_flush(sk)
     return it
 
 
+def rename_key(key, new_name: str):
+    """Rename a key block; its state follows through the key ID. Returns the name Blender assigned."""
+    key.name = new_name
+    bump_generation("stack")
+    return key.name
+
+
+def remove_items(sk, ids):
+    """Remove the state items of sk's keys with the given IDs; returns the number removed."""
+    items = _state_items(sk)
+    if not items:
+        return 0
+    entry = _item_index(items)
+    wanted = set(ids)
+    doomed = sorted({i for kid, i in entry["ids"].items() if kid in wanted})
+    if not doomed:
+        return 0
+    for i in reversed(doomed):
+        items.remove(i)
+
+    # Shift the surviving indices down instead of rebuilding the whole map.
+    entry["ids"] = {kid: i - bisect.bisect_left(doomed, i) for kid, i in entry["ids"].items() if kid not in wanted}
+    entry["len"] = len(items)
+    _GROUP_INDEX.pop(sk.as_pointer(), None)
+    bump_generation("state", "group")
+    return len(doomed)
+
+
+# Rough in-file size of one state item: an IDProperty group plus one property
+# per field (about 136 bytes each in DNA), plus the string payloads.
+_ITEM_BASE_BYTES = 136 * 6
+_SWEEP_SIG = {}    # Key pointer -> signature of the last sweep that found nothing
+
+
+def _item_nbytes(it):
+    return _ITEM_BASE_BYTES + len(it.key_name) + len(it.group) + len(it.tags) + len(it.owner)
+
+
+def _rebuild_items(items, rows):
+    # CollectionProperty.remove() reallocates the whole array on every call;
+    # clearing once and re-adding the survivors stays linear.
+    items.clear()
+    for key_name, kid, owner, selected, group, tags in rows:
+        it = items.add()
+        it.key_name = key_name
+        it.key_id = kid
+        it.owner = owner
+        it.selected = selected
+        it.group = group
+        it.tags = tags
+
+
+def sweep_state_items(sk):
+    """
+    Drop state items of a Key datablock that no longer describe any of its keys.
+
+    Removed: items whose key ID is gone, duplicates of an ID and items that carry
+    no state at all. The collection is rebuilt from the survivors in one pass,
+    so the sweep is linear in its size. Returns (items removed, approximate
+    bytes reclaimed).
+    """
+    items = _state_items(sk)
+    if not items or not sk.key_blocks:
+        return 0, 0
+    # Legacy selection flags only move into the bitmap when it is first built;
+    # build it now so the flags can go. If it can't be stored, keep them.
+    if sk.get("sko_sel") is None:
+        _sel_store(sk, _sel_entry(sk))
+    legacy_sel = sk.get("sko_sel") is None
+    stack = _stack_entry(sk)
+    sig = (len(items), _GEN["items"], _GEN["state"], stack["version"])
+    if _SWEEP_SIG.get(sk.as_pointer()) == sig:
+        return 0, 0
+
+    live = set(stack["ids"])
+    seen = set()
+    keep = []
+    reclaimed = 0
+    for it in items:
+        if it.key_id in live and it.key_id not in seen and (it.group or (legacy_sel and it.selected)):
+            keep.append((it.key_name, it.key_id, it.owner, it.selected, it.group, it.tags))
+        else:
+            reclaimed += _item_nbytes(it)
+        seen.add(it.key_id)
+
+    removed = len(items) - len(keep)
+    if removed:
+        _rebuild_items(items, keep)
+        bump_generation("items", "state", "group")
+    _SWEEP_SIG[sk.as_pointer()] = (len(items), _GEN["items"], _GEN["state"], stack["version"])
+    return removed, reclaimed
+
+
+def migrate_scene_items():
+    """
+    Move state from the old scene-wide Scene.sko_items collections into the
+    sko_items of each Key datablock.
+
+    ID-keyed rows go to the Key named by their owner; legacy name-keyed rows go
+    to every Key that has a key block with that name. Rows for Keys that can't
+    be edited (linked from a library) stay behind; rows that match nothing are
+    dropped. Returns (rows moved, rows dropped).
+    """
+    by_owner = {sk.name_full: sk for sk in bpy.data.shape_keys if sk.key_blocks}
+    moved = dropped = 0
+    for scene in bpy.data.scenes:
+        rows = getattr(scene, 'sko_items', None)
+        if not rows:
+            continue
+        leftover = []
+        for it in rows:
+            if it.key_id:
+                sk = by_owner.get(it.owner)
+                targets = [(sk, it.key_id)] if sk is not None and it.key_id in _stack_entry(sk)["pos"] else []
+            else:
+                targets = []
+                for sk in by_owner.values():
+                    stack = _stack_entry(sk)
+                    j = stack["name_pos"].get(it.key_name, -1)
+                    if j >= 0:
+                        targets.append((sk, stack["ids"][j]))
+            if not targets:
+                dropped += 1
+                continue
+            for sk, kid in targets:
+                if sk.library is not None:
+                    leftover.append((it.key_name, it.key_id, it.owner, it.selected, it.group, it.tags))
+                    continue
+                items = sk.sko_items
+                if _item_lookup(items, kid)[1] is not None:
+                    continue
+                dst = items.add()
+                dst.key_name = sk.key_blocks[_stack_entry(sk)["pos"][kid]].name
+                dst.key_id = kid
+                dst.selected = it.selected
+                dst.group = it.group
+                dst.tags = it.tags
+                _stack_flush(sk)
+                moved += 1
+        _rebuild_items(rows, leftover)
+    if moved or dropped:
+        bump_generation("items", "state", "group")
+    return moved, dropped
+
+
+# Per-Key tuples of group tags aligned with key_blocks, shared by one list redraw.
+_GROUP_SNAPSHOT = {}
+
+
+def tag_snapshot(sk):
+    """Return a tuple with the tags (primary first) of every key block of sk (by index).
+
+    Built with one pass over the stack and reused until the stack, the state
+    collection or any group value changes.
+    """
+    items = _state_items(sk)
+    if sk is None or not items:
+        return ((),) * len(getattr(sk, "key_blocks", ()))
+    stack = _stack_entry(sk)
+    key = (stack["ids"], len(items), _GEN["items"], _GEN["group"])
+    hit = _GROUP_SNAPSHOT.get(sk.as_pointer())
+    if hit and hit[0] == key:
+        return hit[1]
+    index = _item_index(items)["ids"]
+    tags = tuple(_item_tags(items[index[kid]]) if kid in index else () for kid in stack["ids"])
+    _GROUP_SNAPSHOT[sk.as_pointer()] = (key, tags)
+    return tags
+
+
+# Selection is a bitmap per Key datablock: bit i is key block i. It is stored
+# packed into an int array ID property ("sko_sel") next to the key IDs it was
+# written for ("sko_sel_ids"), so it survives save/undo and follows keys that
+# are reordered, renamed or removed.
+_SEL_CACHE = {}    # Key pointer -> {"ids", "mask"}
+
+
+def _sel_pack(mask):
+    packed = np.packbits(mask)
+    pad = (-len(packed)) % 4 if len(packed) else 4
+    return np.pad(packed, (0, pad)).view(np.int32)
+
+
+def _sel_unpack(words, count):
+    bits = np.unpackbits(np.asarray(words, dtype=np.int32).view(np.uint8)).astype(bool)
+    mask = np.zeros(count, dtype=bool)
+    n = min(count, len(bits))
+    mask[:n] = bits[:n]
+    return mask
+
+
+def _sel_entry(sk):
+    """Return the live selection entry of a Key datablock, aligned with its current stack."""
+    stack = _stack_entry(sk)
+    ptr = sk.as_pointer()
+    entry = _SEL_CACHE.get(ptr)
+    if entry is not None and entry["ids"] is stack["ids"]:
+        return entry
+
+    if entry is None:
+        words, stored_ids = sk.get("sko_sel"), sk.get("sko_sel_ids")
+        stored_names = sk.get("sko_sel_names")
+        if words is not None and stored_ids is not None:
+            old_ids = tuple(int(i) for i in stored_ids)
+            old_mask = _sel_unpack(words, len(old_ids))
+        elif words is not None and isinstance(stored_names, str):
+            # Bitmap written before key IDs existed: aligned with stored names.
+            names = stored_names.split("\n") if stored_names else []
+            old_mask = _sel_unpack(words, len(names))
+            pos = stack["name_pos"]
+            old_ids = tuple(stack["ids"][pos[n]] if n in pos else 0 for n in names)
+        else:
+            # First use on this Key: migrate the legacy per-item flags.
+            items = _state_items(sk)
+            old_ids = stack["ids"]
+            old_mask = np.zeros(len(old_ids), dtype=bool)
+            if items:
+                index = _item_index(items)["ids"]
+                for j, kid in enumerate(old_ids):
+                    if kid in index and items[index[kid]].selected:
+                        old_mask[j] = True
+    else:
+        old_ids, old_mask = entry["ids"], entry["mask"]
+
+    if old_ids == stack["ids"]:
+        mask = np.array(old_mask, dtype=bool)
+    else:
+        old_pos = {kid: i for i, kid in enumerate(old_ids) if kid}
+        src = np.fromiter((old_pos.get(kid, -1) for kid in stack["ids"]), dtype=np.intp, count=len(stack["ids"]))
+        mask = np.zeros(len(src), dtype=bool)
+        hit = src >= 0
+        mask[hit] = old_mask[src[hit]]
+    entry = {"ids": stack["ids"], "mask": mask}
+    _SEL_CACHE[ptr] = entry
+    return entry
+
+
+def _sel_store(sk, entry):
+    """Write the bitmap (and the key IDs it is aligned to) into the Key's ID properties."""
+    try:
+        # Assign lists: a NumPy buffer is copied into the existing ID-property
+        # array without resizing it.
+        sk["sko_sel"] = _sel_pack(entry["mask"]).tolist()
+        if entry["ids"]:
+            sk["sko_sel_ids"] = list(entry["ids"])
+        if "sko_sel_names" in sk:
+            del sk["sko_sel_names"]
+    except Exception:
+        # Linked data or a read-only context: keep the in-memory state only.
+        pass
+    _stack_flush(sk)
+    bump_generation("state")
+
+
+def selection_mask(sk):
+    """Return the selection of every key block of sk as a bool array (do not modify)."""
+    if sk is None:
+        return np.zeros(0, dtype=bool)
+    return _sel_entry(sk)["mask"]
+
+
+def set_selection_mask(sk, mask):
+    """Replace the whole selection of sk (bool array with one entry per key block)."""
+    entry = _sel_entry(sk)
+    entry["mask"] = np.array(mask, dtype=bool)
+    _sel_store(sk, entry)
+
+
 def get_sel(key):
-    it = find_item_by_name(key.name)
-    return bool(it.selected) if it else False
+    sk = key.id_data
+    entry = _sel_entry(sk)
+    j = _stack_entry(sk)["name_pos"].get(key.name, -1)
+    return bool(entry["mask"][j]) if j >= 0 else False
 
 
 def set_sel(key, val: bool):
-    it = ensure_item_by_name(key.name, create=True)
-    if it:
-        it.selected = bool(val)
+    sk = key.id_data
+    entry = _sel_entry(sk)
+    j = _stack_entry(sk)["name_pos"].get(key.name, -1)
+    if j < 0 or bool(entry["mask"][j]) == bool(val):
+        return
+    entry["mask"] = entry["mask"].copy()
+    entry["mask"][j] = bool(val)
+    _sel_store(sk, entry)
+
+
+# A key can carry several group tags. SKO_Item.group holds the primary one
+# (shown in the list and used by the Group List sort); SKO_Item.tags holds the
+# others, one per line.
+def _item_tags(it):
+    if not it or not it.group:
+        return ()
+    if not it.tags:
+        return (it.group,)
+    return (it.group,) + tuple(t for t in it.tags.split("\n") if t and t != it.group)
+
+
+# Inverse tag index per Key datablock: tag -> set of key IDs. Built once from
+# the state items and then kept up to date by the tag setters below.
+_GROUP_INDEX = {}   # Key pointer -> {"gen", "members", "bits"}
+
+
+def _group_index(sk):
+    ptr = sk.as_pointer()
+    entry = _GROUP_INDEX.get(ptr)
+    if entry is None or entry["gen"] != _GEN["items"]:
+        members = {}
+        items = _state_items(sk)
+        if items:
+            for kid, i in _item_index(items)["ids"].items():
+                for tag in _item_tags(items[i]):
+                    members.setdefault(tag, set()).add(kid)
+        entry = {"gen": _GEN["items"], "members": members, "bits": None}
+        _GROUP_INDEX[ptr] = entry
+    return entry
+
+
+def group_members(sk, group: str):
+    """IDs of the keys of sk tagged with group (do not modify)."""
+    if sk is None or not group:
+        return frozenset()
+    return _group_index(sk)["members"].get(group, frozenset())
 
 
 def get_group(key):
-    it = find_item_by_name(key.name)
+    it = find_item(key)
     return it.group if it else ""
 
 
+def _set_tags_id(sk, kid: int, name: str, tags):
+    tags = tuple(dict.fromkeys(t for t in tags if t))
+    index = _group_index(sk)
+    it = _ensure_item_id(sk, kid, name, create=bool(tags))
+    if it is None:
+        return False
+    old = _item_tags(it)
+    if old == tags:
+        return False
+    members = index["members"]
+    for tag in set(old).difference(tags):
+        ids = members.get(tag)
+        if ids is not None:
+            ids.discard(kid)
+            if not ids:
+                del members[tag]
+    for tag in tags:
+        members.setdefault(tag, set()).add(kid)
+    it.group = tags[0] if tags else ""
+    it.tags = "\n".join(tags[1:])
+    index["bits"] = None
+    bump_generation("state", "group")
+    return True
+
+
+def _edit_tags_ids(sk, ids, edit):
+    """Replace the tags of each key ID with edit(old_tags); returns how many keys changed."""
+    stack = _stack_entry(sk)
+    items = _state_items(sk)
+    if items is None:
+        return 0
+    changed = 0
+    for kid in ids:
+        j = stack["pos"].get(kid)
+        if j is None:
+            continue
+        old = _item_tags(_item_lookup(items, kid)[1])
+        if _set_tags_id(sk, kid, stack["names"][j], edit(old)):
+            changed += 1
+    return changed
+
+
 def set_group(key, group_name: str):
-    it = ensure_item_by_name(key.name, create=True)
-    if it:
-        it.group = group_name or ""
+    """Make group_name the primary tag of key (an empty name drops the primary tag)."""
+    _edit_tags_ids(key.id_data, [key_id(key)],
+                   lambda old: ((group_name,) if group_name else ()) + old[1:])
+
+
+def tag_ids(sk, ids, tag: str):
+    """Add tag to the keys of sk with the given IDs; returns how many changed."""
+    return _edit_tags_ids(sk, ids, lambda old: old + (tag,))
+
+
+def untag_ids(sk, ids, tag: str = ""):
+    """Remove tag (every tag if empty) from the keys with the given IDs; returns how many changed."""
+    if not tag:
+        return _edit_tags_ids(sk, ids, lambda old: ())
+    return _edit_tags_ids(sk, ids, lambda old: tuple(t for t in old if t != tag))
+
+
+def _selected_key_ids(obj, fallback_to_active=True):
+    """IDs of the selected non-Basis keys of obj (or of the active key if none are selected)."""
+    sk = obj.data.shape_keys
+    stack = _stack_entry(sk)
+    pos = np.flatnonzero(selection_mask(sk))
+    ids = [stack["ids"][j] for j in pos if j != 0]
+    if not ids and fallback_to_active:
+        j = obj.active_shape_key_index
+        if 0 < j < len(stack["ids"]):
+            ids = [stack["ids"][j]]
+    return ids
+
+
+# Group filter expressions: tag names combined with AND/OR/NOT (or & | !) and
+# parentheses, e.g. "Mouth AND NOT ARKit". Each tag is turned into an integer
+# bitset over the stack (bit i = key block i) so a whole expression is a few
+# big-int operations regardless of the number of keys.
+_TAG_TOKEN = re.compile(r'\s*(?:(\()|(\))|(&&?)|(\|\|?)|(!)|"([^"]*)"|([^\s()&|!"]+))')
+_TAG_KEYWORDS = {"and": "&", "or": "|", "not": "!"}
+_TAG_EXPR_CACHE = {}
+
+
+def _tokenize_tag_expr(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    joinable = False
+    while pos < len(text):
+        m = _TAG_TOKEN.match(text, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Unexpected character at {pos}")
+        pos = m.end()
+        lpar, rpar, amp, bar, bang, quoted, word = m.groups()
+        if lpar or rpar:
+            tokens.append(lpar or rpar)
+        elif amp or bar or bang:
+            tokens.append((amp or bar or bang)[0])
+        elif quoted is not None:
+            tokens.append(("tag", quoted))
+        elif word.lower() in _TAG_KEYWORDS:
+            tokens.append(_TAG_KEYWORDS[word.lower()])
+        elif joinable:
+            # Consecutive bare words form one tag name ("Upper Lip").
+            tokens[-1] = ("tag", tokens[-1][1] + " " + word)
+        else:
+            tokens.append(("tag", word))
+        joinable = word is not None and word.lower() not in _TAG_KEYWORDS
+    return tokens
+
+
+def _parse_tag_expr(text):
+    """Parse a group filter into a tree of ("tag", name) / ("!", a) / ("&"|"|", a, b)."""
+    tokens = _tokenize_tag_expr(text)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take():
+        nonlocal pos
+        tok = peek()
+        if tok is None:
+            raise ValueError("Unexpected end of expression")
+        pos += 1
+        return tok
+
+    def parse_or():
+        node = parse_and()
+        while peek() == "|":
+            take()
+            node = ("|", node, parse_and())
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() == "&":
+            take()
+            node = ("&", node, parse_not())
+        return node
+
+    def parse_not():
+        tok = take()
+        if tok == "!":
+            return ("!", parse_not())
+        if tok == "(":
+            node = parse_or()
+            if take() != ")":
+                raise ValueError("Missing ')'")
+            return node
+        if isinstance(tok, tuple):
+            return tok
+        raise ValueError(f"Unexpected '{tok}'")
+
+    node = parse_or()
+    if pos != len(tokens):
+        raise ValueError(f"Unexpected '{tokens[pos]}'")
+    return node
+
+
+def tag_expr(text: str):
+    """Parsed group filter, or None if text is not a valid expression (cached)."""
+    hit = _TAG_EXPR_CACHE.get(text, False)
+    if hit is not False:
+        return hit
+    try:
+        node = _parse_tag_expr(text)
+    except ValueError:
+        node = None
+    if len(_TAG_EXPR_CACHE) > 256:
+        _TAG_EXPR_CACHE.clear()
+    _TAG_EXPR_CACHE[text] = node
+    return node
+
+
+def group_path(name: str) -> str:
+    """Normalize a slash-separated group path ("Face / Mouth/" -> "Face/Mouth")."""
+    return "/".join(seg for seg in (part.strip() for part in (name or "").split("/")) if seg)
+
+
+def _tag_bits(sk):
+    """Tag bitsets of sk over its current stack positions, plus a path trie over the tags (cached)."""
+    entry = _group_index(sk)
+    bits = entry["bits"]
+    stack = _stack_entry(sk)
+    if bits is None or bits["version"] != stack["version"]:
+        pos = stack["pos"]
+        n = len(stack["ids"])
+        table = {}
+        trie = {}
+        for tag, ids in entry["members"].items():
+            flags = np.zeros(n, dtype=bool)
+            flags[[pos[kid] for kid in ids if kid in pos]] = True
+            table[tag] = int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little')
+            node = trie
+            for seg in group_path(tag).split("/"):
+                node = node.setdefault(seg, {})
+            node.setdefault(None, []).append(tag)
+        bits = entry["bits"] = {"version": stack["version"], "n": n, "table": table, "trie": trie, "subtree": {}}
+    return bits
+
+
+def _subtree_bits(bits, path: str):
+    """Bitset of the keys tagged with path or any path below it (None if the trie has no such node)."""
+    cache = bits["subtree"]
+    if path in cache:
+        return cache[path]
+    node = bits["trie"]
+    for seg in path.split("/"):
+        node = node.get(seg)
+        if node is None:
+            break
+    if node is None or not path:
+        result = None
+    else:
+        result = 0
+        todo = [node]
+        while todo:
+            node = todo.pop()
+            for seg, child in node.items():
+                if seg is None:
+                    for tag in child:
+                        result |= bits["table"][tag]
+                else:
+                    todo.append(child)
+    cache[path] = result
+    return result
+
+
+def _eval_tag_expr(node, lookup, universe):
+    op = node[0]
+    if op == "tag":
+        return lookup(node[1])
+    if op == "!":
+        return universe & ~_eval_tag_expr(node[1], lookup, universe)
+    a = _eval_tag_expr(node[1], lookup, universe)
+    b = _eval_tag_expr(node[2], lookup, universe)
+    return a & b if op == "&" else a | b
+
+
+def tag_filter_indices(sk, text: str):
+    """Stack indices of the keys of sk matching the group filter text, as an int array.
+
+    A tag matches keys tagged with it or with any path below it ("Face" also
+    matches "Face/Mouth"). A filter that is exactly a tag path matches that
+    tag even if it reads like an expression. Invalid expressions match nothing.
+    """
+    bits = _tag_bits(sk)
+    n = bits["n"]
+    result = _subtree_bits(bits, group_path(text))
+    if result is None:
+        node = tag_expr(text)
+        lookup = lambda name: _subtree_bits(bits, group_path(name)) or 0
+        result = _eval_tag_expr(node, lookup, (1 << n) - 1) if node else 0
+    if not result:
+        return np.zeros(0, dtype=np.intp)
+    flags = np.unpackbits(np.frombuffer(result.to_bytes((n + 7) // 8, 'little'), dtype=np.uint8), bitorder='little')
+    return np.flatnonzero(flags[:n])
+
+
+def subtree_count(sk, path: str) -> int:
+    """Number of keys of sk tagged with path or any path below it."""
+    if sk is None:
+        return 0
+    return (_subtree_bits(_tag_bits(sk), group_path(path)) or 0).bit_count()
 
 
 def all_groups(context):
@@ -388,33 +1836,279 @@ def all_groups(context):
 
 
 def ensure_group(context, name: str):
-    name = (name or "").strip()
+    """Return the group list entry for the path name, adding it and any missing parents."""
+    name = group_path(name)
     if not name:
         return None
     groups = all_groups(context)
-    for g in groups:
-        if g.name == name:
-            return g
-    g = groups.add()
-    g.name = name
+    existing = {g.name: g for g in groups}
+    parts = name.split("/")
+    g = None
+    for depth in range(1, len(parts) + 1):
+        path = "/".join(parts[:depth])
+        g = existing.get(path)
+        if g is None:
+            g = groups.add()
+            g.name = path
     return g
 
 
+# The scene's group list shown as a tree: an entry's parent is the nearest
+# entry whose path is a prefix of its own. Siblings keep their list order.
+_GROUP_TREE = {}   # Scene pointer -> tree (see group_tree)
+
+
+def group_tree(scene):
+    """Tree layout of scene.sko_groups, cached until the list changes.
+
+    Returns a dict with, per list index: "parent" (list index or -1), "depth",
+    "label" (path relative to the parent entry), "has_children" and "visible"
+    (no collapsed ancestor), plus "order" (indices in depth-first order) and
+    "rank" (path -> position in that order).
+    """
+    groups = getattr(scene, 'sko_groups', None)
+    if groups is None:
+        return {"parent": [], "depth": [], "label": [], "has_children": [], "visible": [], "order": [], "rank": {}}
+    key = (_GEN["group_list"], len(groups))
+    hit = _GROUP_TREE.get(scene.as_pointer())
+    if hit and hit[0] == key:
+        return hit[1]
+
+    names = [g.name for g in groups]
+    expanded = [g.expanded for g in groups]
+    first = {}
+    for i, name in enumerate(names):
+        first.setdefault(name, i)
+    n = len(names)
+    parent = [-1] * n
+    children = [[] for _ in range(n)]
+    roots = []
+    for i, name in enumerate(names):
+        path = name.rpartition("/")[0]
+        while path:
+            j = first.get(path)
+            if j is not None:
+                parent[i] = j
+                break
+            path = path.rpartition("/")[0]
+        (children[parent[i]] if parent[i] >= 0 else roots).append(i)
+
+    depth = [0] * n
+    visible = [True] * n
+    order = []
+    todo = list(reversed(roots))
+    while todo:
+        i = todo.pop()
+        order.append(i)
+        for c in reversed(children[i]):
+            depth[c] = depth[i] + 1
+            visible[c] = visible[i] and expanded[i]
+            todo.append(c)
+    label = [names[i][len(names[parent[i]]) + 1:] if parent[i] >= 0 else names[i] for i in range(n)]
+    rank = {}
+    for r, i in enumerate(order):
+        rank.setdefault(names[i], r)
+    tree = {
+        "parent": parent, "depth": depth, "label": label, "has_children": [bool(c) for c in children],
+        "visible": visible, "order": order, "rank": rank,
+    }
+    _GROUP_TREE[scene.as_pointer()] = (key, tree)
+    return tree
+
+
+def group_rank(tree, path: str):
+    """Tree position of path, or of its nearest listed parent; None if neither is listed."""
+    path = group_path(path)
+    while path:
+        r = tree["rank"].get(path)
+        if r is not None:
+            return r
+        path = path.rpartition("/")[0]
+    return None
+
+
+# =====================================================
+# Name search
+# =====================================================
+# Per-stack search index: case-folded names plus a trigram -> key indices map,
+# so a query only verifies keys that contain all of its trigrams. The last
+# query's raw matches are kept per slot; a query that extends it only re-checks those.
+_SEARCH_INDEX = {}      # Key pointer -> {"gen", "names", "folded", "trigrams", "last"}
+_SEARCH_PATTERNS = {}   # (mode, case_sensitive, query) -> compiled pattern or None
+_GLOB_WILDCARDS = re.compile(r'\*|\?|\[[^\]]*\]')
+_FUZZY_WORD_BREAKS = frozenset(" _.-/|")
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _search_index(sk):
+    ptr = sk.as_pointer()
+    entry = _SEARCH_INDEX.get(ptr)
+    stack = _stack_entry(sk)
+    if entry is None or entry["version"] != stack["version"]:
+        names = stack["names"]
+        folded = [n.lower() for n in names]
+        trigrams = {}
+        for i, name in enumerate(folded):
+            for tri in _trigrams(name):
+                trigrams.setdefault(tri, []).append(i)
+        entry = {"version": stack["version"], "names": names, "folded": folded,
+                 "trigrams": {tri: frozenset(ids) for tri, ids in trigrams.items()}, "last": {}}
+        _SEARCH_INDEX[ptr] = entry
+    return entry
+
+
+def search_pattern(query: str, mode: str, case_sensitive: bool = False):
+    """Compiled pattern for a GLOB or REGEX query, or None if it is invalid (cached)."""
+    key = (mode, case_sensitive, query)
+    if key in _SEARCH_PATTERNS:
+        return _SEARCH_PATTERNS[key]
+    flags = 0 if case_sensitive else re.IGNORECASE
+    try:
+        if mode == 'GLOB':
+            pattern = re.compile(fnmatch.translate(query), flags)
+        else:
+            pattern = re.compile(query, flags)
+    except re.error:
+        pattern = None
+    if len(_SEARCH_PATTERNS) > 256:
+        _SEARCH_PATTERNS.clear()
+    _SEARCH_PATTERNS[key] = pattern
+    return pattern
+
+
+def fuzzy_score(query: str, name: str):
+    """Score name as a subsequence match of query (both case-folded), or None if it isn't one.
+
+    Every matched character scores 1, plus 2 when it directly follows the
+    previous match and 2 when it starts a word.
+    """
+    score = 0
+    pos = -1
+    for ch in query:
+        i = name.find(ch, pos + 1)
+        if i < 0:
+            return None
+        score += 1
+        if pos >= 0 and i == pos + 1:
+            score += 2
+        if i == 0 or name[i - 1] in _FUZZY_WORD_BREAKS:
+            score += 2
+        pos = i
+    return score
+
+
+def _search_candidates(entry, literals, last, query, mode, case_sensitive):
+    """Key indices that can possibly match: previous matches and/or trigram hits."""
+    candidates = None
+    # Anything matching a query also matches any query it contains (for fuzzy
+    # matching too: a substring is a subsequence).
+    if last and last[0] == mode and last[1] == case_sensitive and last[2] and last[2] in query:
+        candidates = last[3]
+    trigrams = entry["trigrams"]
+    for literal in literals:
+        for tri in _trigrams(literal.lower()):
+            hits = trigrams.get(tri, frozenset())
+            candidates = hits if candidates is None else candidates & hits
+            if not candidates:
+                return frozenset()
+    return range(len(entry["names"])) if candidates is None else candidates
+
+
+def search_indices(sk, query: str, mode: str = 'SUBSTRING', case_sensitive: bool = False, slot: str = "search"):
+    """Sorted indices of the keys of sk whose names match query.
+
+    mode is one of 'SUBSTRING', 'GLOB' (whole-name fnmatch pattern), 'REGEX'
+    (re.search) or 'FUZZY' (subsequence match, keeping matches that score at
+    least half of the best one). Invalid patterns match nothing. Each slot
+    (the Search field, the Find field) refines from its own previous query.
+    """
+    entry = _search_index(sk)
+    if not query:
+        return tuple(range(len(entry["names"])))
+    names = entry["names"] if case_sensitive else entry["folded"]
+    q = query if case_sensitive else query.lower()
+    last = entry["last"].get(slot)
+
+    if mode == 'REGEX':
+        pattern = search_pattern(query, mode, case_sensitive)
+        raw = frozenset(i for i, n in enumerate(entry["names"]) if pattern.search(n)) if pattern else frozenset()
+    elif mode == 'GLOB':
+        pattern = search_pattern(query, mode, case_sensitive)
+        literals = [part for part in _GLOB_WILDCARDS.split(query) if len(part) >= 3]
+        candidates = _search_candidates(entry, literals, None, q, mode, case_sensitive)
+        raw = frozenset(i for i in candidates if pattern.match(entry["names"][i])) if pattern else frozenset()
+    elif mode == 'FUZZY':
+        candidates = _search_candidates(entry, (), last, q, mode, case_sensitive)
+        raw = frozenset(i for i in candidates if fuzzy_score(q, names[i]) is not None)
+    else:
+        candidates = _search_candidates(entry, (q,), last, q, mode, case_sensitive)
+        raw = frozenset(i for i in candidates if q in names[i])
+    entry["last"][slot] = (mode, case_sensitive, q, raw)
+
+    if mode == 'FUZZY' and raw:
+        scores = {i: fuzzy_score(q, names[i]) for i in raw}
+        cutoff = max(scores.values()) / 2
+        return tuple(sorted(i for i, s in scores.items() if s >= cutoff))
+    return tuple(sorted(raw))
+
+
+def _filter_stack(ks, query: str, group: str, mode: str = 'SUBSTRING'):
+    """Run the Search/Group filter over ks; returns (indices, names) of the visible keys."""
+    sk = ks.id_data
+    all_names = _stack_entry(sk)["names"]
+    indices = search_indices(sk, query, mode) if query else range(len(all_names))
+    if group:
+        # Only keys matching the group expression are kept.
+        tagged = set(tag_filter_indices(sk, group).tolist())
+        indices = [i for i in indices if i in tagged]
+    return tuple(indices), tuple(all_names[i] for i in indices)
+
+
+# Last filter result per (object, Key datablock).
+_FILTER_CACHE = {}
+
+
+def filter_result(context, obj):
+    """Return (indices, names) of the keys visible under the current Search/Group filter.
+
+    The result is memoized on (object, Key datablock, search, group filter,
+    key-stack version) so repeated calls from operators and the list only
+    re-filter when one of those inputs changes.
+    """
+    sk = getattr(getattr(obj, 'data', None), 'shape_keys', None)
+    ks = getattr(sk, 'key_blocks', None)
+    if not ks:
+        return (), ()
+    props = context.scene.shapekey_organizer
+    query = props.search.strip()
+    mode = props.search_mode
+    group = props.filter_group.strip()
+
+    owner = (obj.as_pointer(), sk.as_pointer())
+    key = (query, mode, group, _stack_entry(sk)["version"], _GEN["group"] if group else 0)
+    hit = _FILTER_CACHE.get(owner)
+    if hit and hit[0] == key:
+        return hit[1]
+    result = _filter_stack(ks, query, group, mode)
+    _FILTER_CACHE[owner] = (key, result)
+    return result
+
+
 def filtered_keys(context, obj):
     ks = iter_keyblocks(obj)
     if not ks:
         return []
-    props = context.scene.shapekey_organizer
-    query = props.search.lower().strip()
-    group = props.filter_group.strip()
-    out = []
-    for k in ks:
-        if query and query not in k.name.lower():
-            continue
-        if group and get_group(k) != group:
-            continue
-        out.append(k)
-    return out
+    indices, _names = filter_result(context, obj)
+    return [ks[i] for i in indices]
+
+
+def _sko_visible_indices(context, obj, skip_basis=False):
+    """Indices of the keys visible under the current filter, as an int array."""
+    idx = np.asarray(filter_result(context, obj)[0], dtype=np.intp)
+    return idx[idx != 0] if skip_basis else idx
 
 
 def is_basis_key(obj, key):
@@ -422,22 +2116,245 @@ def is_basis_key(obj, key):
     return bool(ks) and key == ks[0]
 
 
-def _ensure_active_not_basis(obj):
-    """If active key lands on Basis (index 0), push it down to index 1."""
-    try:
-        while obj.active_shape_key_index == 0:
-            bpy.ops.object.shape_key_move(type='DOWN')
-    except Exception:
-        pass
+def _sko_simulate_move(order, i, move, relative=True):
+    """Apply one shape_key_move of order[i] to the list order in place; returns its new index.
 
+    Mirrors Blender: on relative stacks 'TOP' stops right under the Basis unless
+    the key is already at index 0 or 1, in which case it replaces the Basis.
+    """
+    last = len(order) - 1
+    if move == 'TOP':
+        j = 1 if (relative and i > 1) else 0
+        order.insert(j, order.pop(i))
+        return j
+    if move == 'BOTTOM':
+        order.append(order.pop(i))
+        return last
+    if move == 'UP':
+        j = i - 1 if i > 0 else last
+    else:
+        j = i + 1 if i < last else 0
+    if abs(i - j) == 1:
+        order[i], order[j] = order[j], order[i]
+    else:
+        # Blender wraps around at the ends of the list.
+        order.insert(j, order.pop(i))
+    return j
+
+
+def _sko_lis(seq):
+    """Return the positions of one longest strictly increasing subsequence of seq."""
+    tails, tail_pos = [], []
+    prev = [-1] * len(seq)
+    for i, v in enumerate(seq):
+        j = bisect.bisect_left(tails, v)
+        if j == len(tails):
+            tails.append(v)
+            tail_pos.append(i)
+        else:
+            tails[j] = v
+            tail_pos[j] = i
+        prev[i] = tail_pos[j - 1] if j else -1
+    out = []
+    i = tail_pos[-1] if tail_pos else -1
+    while i >= 0:
+        out.append(i)
+        i = prev[i]
+    out.reverse()
+    return out
 
-def move_active_to_top_below_basis(obj):
-    """Move currently active shape key to the top *below Basis* (index 1)."""
-    try:
-        bpy.ops.object.shape_key_move(type='TOP')
-        _ensure_active_not_basis(obj)
-    except Exception:
-        pass
+
+def _sko_plan_keep_lis(current, final, relative=True):
+    """Keep the longest already-ordered subsequence in place; move every other key next to its predecessor."""
+    rank = {x: r for r, x in enumerate(final)}
+    placed = {current[i] for i in _sko_lis([rank[x] for x in current])}
+    order = list(current)
+    pos = {x: i for i, x in enumerate(order)}
+    last = len(order) - 1
+    plan = []
+    for r in range(1, len(final)):
+        x = final[r]
+        if x in placed:
+            continue
+        c = pos[x]
+        p = pos[final[r - 1]]
+        t = p if c < p else p + 1
+
+        # Cheapest of: step there, jump to the top and step down, jump to the bottom and step up.
+        # Every route ends with x at t, so each step's index follows from where the route starts.
+        routes = [(abs(c - t), None, c), (1 + last - t, 'BOTTOM', last)]
+        if relative and c > 1:
+            routes.append((t, 'TOP', 1))
+        elif not relative:
+            routes.append((1 + t, 'TOP', 0))
+        _cost, jump, start = min(routes, key=lambda route: route[0])
+        if jump:
+            plan.append((c, jump))
+        if start > t:
+            plan.extend((i, 'UP') for i in range(start, t, -1))
+        else:
+            plan.extend((i, 'DOWN') for i in range(start, t))
+
+        # Only the keys between c and t shift.
+        order.insert(t, order.pop(c))
+        lo, hi = (c, t) if c < t else (t, c)
+        pos.update(zip(order[lo:hi + 1], range(lo, hi + 1)))
+        placed.add(x)
+    return plan
+
+
+def _sko_fenwick_add(tree, i, delta):
+    """Add delta at slot i of the Fenwick tree (a list of len slots + 1)."""
+    i += 1
+    while i < len(tree):
+        tree[i] += delta
+        i += i & -i
+
+
+def _sko_fenwick_sum(tree, i):
+    """Sum of slots 0..i of the Fenwick tree."""
+    i += 1
+    total = 0
+    while i > 0:
+        total += tree[i]
+        i -= i & -i
+    return total
+
+
+def _sko_plan_keep_block(current, final, relative=True):
+    """Keep the longest ordered run of final in place; send the keys before it to the top and the rest to the bottom."""
+    pos = {x: i for i, x in enumerate(current)}
+    n = len(final)
+    top_cost = 1 if relative else 2
+    best = (n - 1, 1, 0)  # (cost, first, last): empty run, everything goes to the bottom
+    a = 1
+    for b in range(1, n):
+        if b > a and pos[final[b]] < pos[final[b - 1]]:
+            a = b
+        cost = top_cost * (a - 1) + (n - 1 - b)
+        if cost < best[0]:
+            best = (cost, a, b)
+    _cost, a, b = best
+
+    # Track positions as occupied slots: the Basis in slot 0, keys sent to the
+    # top in slots a-1 down to 1, the untouched order from slot a, keys sent to
+    # the bottom after it. A key's index is the number of occupied slots before it.
+    slot = {x: (a + i if i else 0) for i, x in enumerate(current)}
+    tree = [0] * (a + 2 * n + 1)
+    for s in slot.values():
+        _sko_fenwick_add(tree, s, 1)
+
+    def move(x, to):
+        _sko_fenwick_add(tree, slot[x], -1)
+        _sko_fenwick_add(tree, to, 1)
+        slot[x] = to
+
+    plan = []
+    for r in range(a - 1, 0, -1):
+        c = _sko_fenwick_sum(tree, slot[final[r]]) - 1
+        if c == 1:
+            continue
+        plan.append((c, 'TOP'))
+        if not relative:
+            plan.append((0, 'DOWN'))
+        move(final[r], r)
+    for k, r in enumerate(range(b + 1, n)):
+        c = _sko_fenwick_sum(tree, slot[final[r]]) - 1
+        plan.append((c, 'BOTTOM'))
+        move(final[r], a + n + k)
+    return plan
+
+
+def _sko_plan_step_up(current, final, relative=True):
+    """Fallback: walk each key of final up to its index in turn with single UP moves."""
+    order = list(current)
+    pos = {x: i for i, x in enumerate(order)}
+    plan = []
+    for r, x in enumerate(final):
+        c = pos.get(x, -1)
+        if c < r:
+            break
+        plan.extend((i, 'UP') for i in range(c, r, -1))
+        order.insert(r, order.pop(c))
+        pos.update(zip(order[r:c + 1], range(r, c + 1)))
+    return plan
+
+
+def _sko_plan_reorder(current, final, relative=True):
+    """
+    Plan the shape_key_move calls that turn the key order current into final.
+
+    Both are lists of the same ids, with the Basis first in each. relative is
+    the Key's use_relative flag. Returns a list of (active index, move type)
+    steps, picking the shorter of two strategies: keep the longest increasing
+    subsequence in place, or keep the longest ordered run and move the rest to
+    the ends. If neither replays to final, a plain key-by-key plan is tried;
+    returns None when no plan reaches final.
+    """
+    final = list(final)
+    if list(current) == final:
+        return []
+
+    def replays(plan):
+        order = list(current)
+        for i, move in plan:
+            _sko_simulate_move(order, i, move, relative)
+        return order == final
+
+    candidates = [plan for plan in (planner(current, final, relative)
+                                    for planner in (_sko_plan_keep_lis, _sko_plan_keep_block))
+                  if replays(plan)]
+    if candidates:
+        return min(candidates, key=len)
+    plan = _sko_plan_step_up(current, final, relative)
+    return plan if replays(plan) else None
+
+
+def _sko_block_move_order(count, selected, direction, amount=1):
+    """
+    Final order (list of current indices) after moving the selected indices as a block.
+
+    direction: 'TOP', 'UP', 'DOWN' or 'BOTTOM'; UP/DOWN move each selected key by
+    amount, stopping at the ends or against another selected key. Index 0 (Basis)
+    never moves and the selected keys keep their relative order.
+    """
+    body = list(range(1, count))
+    sel = [i for i in body if i in selected]
+    rest = [i for i in body if i not in selected]
+    if direction == 'TOP':
+        return [0] + sel + rest
+    if direction == 'BOTTOM':
+        return [0] + rest + sel
+
+    # Positions within body (Basis excluded) for the selected keys.
+    slots = [None] * len(body)
+    if direction == 'UP':
+        floor = 0
+        for i in sel:
+            p = max(floor, (i - 1) - amount)
+            slots[p] = i
+            floor = p + 1
+    else:
+        ceil = len(body) - 1
+        for i in reversed(sel):
+            p = min(ceil, (i - 1) + amount)
+            slots[p] = i
+            ceil = p - 1
+    it = iter(rest)
+    return [0] + [i if i is not None else next(it) for i in slots]
+
+
+def _sko_apply_reorder_plan(obj, plan, active_index=None):
+    """Run a plan from _sko_plan_reorder on obj; optionally re-activate active_index afterwards."""
+    for i, move in plan:
+        if obj.active_shape_key_index != i:
+            obj.active_shape_key_index = i
+        bpy.ops.object.shape_key_move(type=move)
+    if active_index is not None:
+        obj.active_shape_key_index = active_index
+    # Key IDs follow the moved key blocks, and the selection bitmap follows the IDs.
+    bump_generation("stack")
+    return len(plan)
 
 # =====================================================
 # Properties
@@ -446,14 +2363,27 @@ def move_active_to_top_below_basis(obj):
 class SKO_Props(PropertyGroup):
     search: StringProperty(
         name="Search",
-        description="Filter shapekeys whose name contains this text (case-insensitive)",
+        description="Filter shapekeys by name (case-insensitive), as set by the search mode",
         default="",
     )
+    search_mode: EnumProperty(
+        name="Search Mode",
+        description="How the Search text is matched against shapekey names",
+        items=[
+            ('SUBSTRING', "Contains", "Names containing the text"),
+            ('GLOB', "Wildcard", "Whole names matching a wildcard pattern such as Mouth_*_L (* ? [abc])"),
+            ('REGEX', "Regex", "Names matching a regular expression anywhere"),
+            ('FUZZY', "Fuzzy", "Names containing the typed characters in order, best matches only"),
+        ],
+        default='SUBSTRING',
+    )
     filter_group: StringProperty(
         name="Group",
-        description="Show only keys assigned to this exact group tag",
+        description=(
+            "Show only keys with this group tag. Combine tags with AND, OR, NOT and "
+            "parentheses, e.g. Mouth AND NOT ARKit; quote names that contain operators"
+        ),
         default="",
-        options={'HIDDEN'}
     )
     anchor_index: IntProperty(
         name="Selection Anchor Index",
@@ -473,7 +2403,10 @@ class SKO_Props(PropertyGroup):
     )
     find: StringProperty(
         name="Find",
-        description="Auto-selects keys whose names contain this text; used by Find & Replace",
+        description=(
+            "Selects keys whose names contain this text once you stop typing, and deselects "
+            "keys that stop matching; used by Find & Replace"
+        ),
         default="",
         update=_on_find_change,
     )
@@ -481,6 +2414,7 @@ class SKO_Props(PropertyGroup):
         name="Case Sensitive",
         description="Treat Find & Replace as case-sensitive (off = case-insensitive)",
         default=False,
+        update=_on_find_change,
     )
     replace: StringProperty(
         name="Replace",
@@ -493,10 +2427,15 @@ class SKO_Props(PropertyGroup):
         items=[
             ('NAME_ASC', "Name A→Z", "Sort by name ascending"),
             ('NAME_DESC', "Name Z→A", "Sort by name descending"),
-            ('GROUP_LIST', "Group List → Name", "Follow custom group list order, then Name A→Z"),
+            ('GROUP_LIST', "Group List → Name", "Follow the group tree order (depth-first), then Name A→Z"),
         ],
         default='NAME_ASC'
     )
+    move_amount: IntProperty(
+        name="Steps",
+        description="How many positions Up/Down moves the selected keys",
+        default=1, min=1,
+    )
     auto_number_start: IntProperty(
         name="Start",
         description="Starting number for Auto-Number",
@@ -556,12 +2495,12 @@ class SKO_UL_ShapeKeys(UIList):
         key = item
         if not key:
             return
-        sel = get_sel(key)
 
         obj = context.object
         is_active = (getattr(obj, "active_shape_key_index", -1) == index)
-        sel = get_sel(key)
-        gname = get_group(key)
+        sk = key.id_data
+        tags = tag_snapshot(sk)[index]
+        sel = bool(selection_mask(sk)[index])
 
         split = layout.split(factor=0.5)
         left  = split.row(align=True)
@@ -580,8 +2519,9 @@ class SKO_UL_ShapeKeys(UIList):
 
         group_cell = left_split.row(align=True)
         group_cell.alignment = 'RIGHT'
-        if gname:
-            group_cell.label(text=gname, icon='OUTLINER_COLLECTION')
+        if tags:
+            text = tags[0] if len(tags) == 1 else f"{tags[0]} +{len(tags) - 1}"
+            group_cell.label(text=text, icon='OUTLINER_COLLECTION')
         else:
             group_cell.separator()
 
@@ -601,17 +2541,22 @@ class SKO_UL_ShapeKeys(UIList):
         except Exception:
             ks = []
         props = getattr(context.scene, 'shapekey_organizer', None)
-        query = (props.search.lower().strip() if props else "")
-        group = (props.filter_group.strip() if props else "")
-
-        flt_flags = []
-        for k in ks:
-            show = True
-            if query and query not in k.name.lower():
-                show = False
-            if show and group and get_group(k) != group:
-                show = False
-            flt_flags.append(self.bitflag_filter_item if show else 0)
+
+        obj = context.object
+        count = len(ks)
+        if props and ks and len(_stack_entry(data)["ids"]) != count:
+            # Keys were added or removed without an update the handler recognised.
+            bump_generation("stack")
+        if props and obj and getattr(obj.data, 'shape_keys', None) == data:
+            visible, _names = filter_result(context, obj)
+        elif props:
+            visible, _names = _filter_stack(ks, props.search.strip(), props.filter_group.strip(), props.search_mode)
+        else:
+            visible = range(count)
+
+        flt_flags = [0] * count
+        for i in visible:
+            flt_flags[i] = self.bitflag_filter_item
         return flt_flags, list(range(len(flt_flags)))
 
 
@@ -628,18 +2573,33 @@ class SKO_UL_Groups(UIList):
         self.use_filter_sort_alpha = False
         self.use_filter_sort_reverse = False
 
-        try:
-            items = getattr(data, propname)
-        except Exception:
-            items = []
-        flags = [self.bitflag_filter_item] * len(items)
-        return flags, list(range(len(items)))
+        tree = group_tree(data)
+        flags = [self.bitflag_filter_item if v else 0 for v in tree["visible"]]
+        neworder = [0] * len(tree["order"])
+        for pos, i in enumerate(tree["order"]):
+            neworder[i] = pos
+        return flags, neworder
 
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
         if not item:
             return
+        tree = group_tree(data)
+        if index >= len(tree["depth"]):
+            return
         row = layout.row(align=True)
-        row.label(text=item.name)
+        for _ in range(tree["depth"][index]):
+            row.label(text="", icon='BLANK1')
+        if tree["has_children"][index]:
+            row.prop(item, 'expanded', text="", emboss=False,
+                     icon='TRIA_DOWN' if item.expanded else 'TRIA_RIGHT')
+        else:
+            row.label(text="", icon='BLANK1')
+        row.label(text=tree["label"][index])
+        obj = context.object
+        sk = getattr(getattr(obj, 'data', None), 'shape_keys', None) if obj else None
+        sub = row.row(align=True)
+        sub.alignment = 'RIGHT'
+        sub.label(text=str(subtree_count(sk, item.name)))
 
 # =====================================================
 # Operators
@@ -731,10 +2691,7 @@ class SKO_OT_KeyActivateOrRename(Operator):
 
         new = self.new_name.strip()
         if new and new != kb.name:
-            it = ensure_item_by_name(kb.name, create=True)
-            kb.name = new
-            if it:
-                it.key_name = new
+            rename_key(kb, new)
         return {'FINISHED'}
 
 
@@ -792,8 +2749,54 @@ class SKO_OT_ShapeKeyAdd(Operator):
         default=False,
         options={'SKIP_SAVE'},
     )
+    mirror_tolerance: bpy.props.FloatProperty(
+        name="Tolerance",
+        description="Maximum distance between a vertex and its mirrored partner on the Basis",
+        default=0.0001, min=0.0, soft_max=0.01,
+        precision=5,
+        subtype='DISTANCE',
+    )
 
     # Only used when mode == SPLIT
+    split_axis: bpy.props.EnumProperty(
+        name="Split Axis",
+        description="Plane the halves are split across",
+        items=[
+            ('X',     "X",     "Split across the YZ plane (left = -X)"),
+            ('Y',     "Y",     "Split across the XZ plane (left = -Y)"),
+            ('Z',     "Z",     "Split across the XY plane (left = -Z)"),
+            ('PLANE', "Plane", "Split across a custom plane (left = behind the normal)"),
+        ],
+        default='X',
+    )
+    split_plane_co: bpy.props.FloatVectorProperty(
+        name="Plane Point",
+        description="A point on the custom split plane (object space)",
+        size=3, subtype='XYZ',
+        default=(0.0, 0.0, 0.0),
+    )
+    split_plane_no: bpy.props.FloatVectorProperty(
+        name="Plane Normal",
+        description="Normal of the custom split plane (object space); points to the right half",
+        size=3, subtype='XYZ',
+        default=(1.0, 0.0, 0.0),
+    )
+    split_falloff: bpy.props.EnumProperty(
+        name="Falloff",
+        description="How deltas are divided between the halves near the split plane",
+        items=[
+            ('NONE',   "Hard",   "Cut at the plane (within Threshold both halves keep the full delta)"),
+            ('LINEAR', "Linear", "Blend linearly across the band"),
+            ('SMOOTH', "Smooth", "Blend with a smoothstep curve across the band"),
+        ],
+        default='NONE',
+    )
+    split_band: bpy.props.FloatProperty(
+        name="Band Width",
+        description="Width of the blend band centred on the split plane",
+        default=0.05, min=0.0, soft_max=1.0,
+        subtype='DISTANCE',
+    )
     split_eps: bpy.props.FloatProperty(
         name="Threshold",
         description="Vertices within this distance of the split plane are kept (prevents tiny holes)",
@@ -855,6 +2858,8 @@ class SKO_OT_ShapeKeyAdd(Operator):
         elif self.mode == 'DUP_MIRROR':
             col.prop(self, "duplicate_suffix", text="Suffix")
             col.prop(self, "use_topology", text="Use Topology")
+            if not self.use_topology:
+                col.prop(self, "mirror_tolerance")
             box = layout.box()
             box.label(text="Tip: If Prefix and Suffix are empty,")
             box.label(text="Duplicates are suffixed with \"_Mirror\"")
@@ -864,7 +2869,18 @@ class SKO_OT_ShapeKeyAdd(Operator):
             col.prop(self, "split_right_token", text="Right Suffix")
 
             row = layout.row(align=True)
-            row.prop(self, "split_eps")
+            row.prop(self, "split_axis", expand=True)
+            if self.split_axis == 'PLANE':
+                col = layout.column(align=True)
+                col.prop(self, "split_plane_co")
+                col.prop(self, "split_plane_no")
+
+            row = layout.row(align=True)
+            row.prop(self, "split_falloff", text="")
+            if self.split_falloff == 'NONE':
+                row.prop(self, "split_eps")
+            else:
+                row.prop(self, "split_band")
 
             row =  layout.row(align=True)
             row.prop(self, "keep_original")
@@ -881,22 +2897,21 @@ class SKO_OT_ShapeKeyAdd(Operator):
 
         props = context.scene.shapekey_organizer
 
-        try:
-            bpy.ops.object.mode_set(mode='OBJECT')
-        except Exception:
-            pass
+        if not _sko_ensure_object_mode(obj):
+            self.report({'WARNING'}, "Leave Edit Mode to create shapekeys.")
+            return {'CANCELLED'}
 
-        def _finalize_new_key():
-            ks = getattr(getattr(obj.data, 'shape_keys', None), 'key_blocks', None)
-            if not ks:
-                return None
-            new_key = ks[-1]
-            if self.key_name.strip():
-                new_key.name = self.key_name.strip()
-            obj.active_shape_key_index = len(ks) - 1
-            it = ensure_item_by_name(new_key.name, create=True)
-            if it:
-                it.selected = True
+        def _finalize(new_keys):
+            ks = iter_keyblocks(obj)
+            if new_keys and ks:
+                # One bitmap write for all new keys instead of one per key.
+                sk = obj.data.shape_keys
+                name_pos = _stack_entry(sk)["name_pos"]
+                mask = selection_mask(sk).copy()
+                mask[[name_pos[nk.name] for nk in new_keys if nk.name in name_pos]] = True
+                set_selection_mask(sk, mask)
+            if new_keys and ks:
+                obj.active_shape_key_index = ks.find(new_keys[-1].name)
             try:
                 bpy.context.view_layer.update()
                 for win in bpy.context.window_manager.windows:
@@ -905,36 +2920,29 @@ class SKO_OT_ShapeKeyAdd(Operator):
                             area.tag_redraw()
             except Exception:
                 pass
-            return new_key
+            self.key_name = ""
 
         if self.mode == 'EMPTY':
             try:
-                bpy.ops.object.shape_key_add(from_mix=False)
+                new_keys = _sko_create_keys(obj, [self.key_name.strip()])
             except Exception as e:
                 self.report({'ERROR'}, f"Could not create shapekey: {e}")
                 return {'CANCELLED'}
-            new_key = _finalize_new_key()
-            self.report({'INFO'}, f"Created shapekey: {new_key.name if new_key else '(unknown)'}")
-            self.key_name = ""
+            _finalize(new_keys)
+            self.report({'INFO'}, f"Created shapekey: {new_keys[0].name}")
             return {'FINISHED'}
 
         if self.mode == 'MIX_ALL':
             try:
-                bpy.ops.object.shape_key_add(from_mix=True)
+                new_keys = _sko_create_keys(obj, [self.key_name.strip()], from_mix=True)
             except Exception as e:
                 self.report({'ERROR'}, f"Could not create shapekey from mix: {e}")
                 return {'CANCELLED'}
-            new_key = _finalize_new_key()
-            self.report({'INFO'}, f"Captured full mix to: {new_key.name if new_key else '(unknown)'}")
-            self.key_name = ""
+            _finalize(new_keys)
+            self.report({'INFO'}, f"Captured full mix to: {new_keys[0].name}")
             return {'FINISHED'}
 
         if self.mode == 'DUP_SELECTED':
-            obj = active_obj_mesh(context)
-            if not obj:
-                self.report({'WARNING'}, "Select a mesh object with shapekeys.")
-                return {'CANCELLED'}
-
             ks = list(iter_keyblocks(obj))
             if not ks:
                 self.report({'WARNING'}, "No shapekeys to duplicate.")
@@ -949,94 +2957,25 @@ class SKO_OT_ShapeKeyAdd(Operator):
                 self.report({'INFO'}, "No selected shapekeys to duplicate.")
                 return {'CANCELLED'}
 
-            values_cache = {k.name: float(getattr(k, "value", 0.0)) for k in ks}
-
-            try:
-                bpy.ops.object.mode_set(mode='OBJECT')
-            except Exception:
-                pass
-
-            created = 0
-            last_new_name = ""
-
             multi = (len(targets) > 1)
             name_prefix = self.key_name.strip()
             suffix = self.duplicate_suffix
-
-            for src in targets:
-                for k in ks:
-                    try:
-                        k.value = 0.0
-                    except Exception:
-                        pass
-                try:
-                    src.value = 1.0
-                except Exception:
-                    pass
-
-                try:
-                    bpy.ops.object.shape_key_add(from_mix=True)
-                except Exception as e:
-                    for k in ks:
-                        try:
-                            k.value = values_cache.get(k.name, 0.0)
-                        except Exception:
-                            pass
-                    self.report({'ERROR'}, f"Duplicate failed on '{src.name}': {e}")
-                    return {'CANCELLED'}
-
-                new_key = obj.data.shape_keys.key_blocks[-1]
-
-                if multi:
-                    new_key.name = f"{name_prefix}{src.name}{suffix}"
-                else:
-                    base_name = name_prefix if name_prefix and not multi else src.name
-                    if name_prefix and not multi:
-                        new_key.name = f"{name_prefix}{suffix}"
-                    else:
-                        new_key.name = f"{name_prefix}{src.name}{suffix}"
-
-
-                try:
-                    new_key.slider_min = float(getattr(src, "slider_min", 0.0))
-                    new_key.slider_max = float(getattr(src, "slider_max", 1.0))
-                except Exception:
-                    pass
-
-                obj.active_shape_key_index = len(obj.data.shape_keys.key_blocks) - 1
-                it = ensure_item_by_name(new_key.name, create=True)
-                if it:
-                    it.selected = True
-
-                last_new_name = new_key.name
-                created += 1
-
-                for k in ks:
-                    try:
-                        k.value = values_cache.get(k.name, 0.0)
-                    except Exception:
-                        pass
+            if name_prefix and not multi:
+                names = [f"{name_prefix}{suffix}"]
+            else:
+                names = [f"{name_prefix}{src.name}{suffix}" for src in targets]
 
             try:
-                bpy.context.view_layer.update()
-                for win in bpy.context.window_manager.windows:
-                    for area in win.screen.areas:
-                        if area.type in {'PROPERTIES', 'VIEW_3D'}:
-                            area.tag_redraw()
-            except Exception:
-                pass
-
-            self.key_name = ""
+                new_keys = _sko_create_keys(obj, names, (_kb_read_co(src) for src in targets), like=targets)
+            except Exception as e:
+                self.report({'ERROR'}, f"Duplicate failed: {e}")
+                return {'CANCELLED'}
 
-            self.report({'INFO'}, f"Duplicated {created} shapekey(s).")
+            _finalize(new_keys)
+            self.report({'INFO'}, f"Duplicated {len(new_keys)} shapekey(s).")
             return {'FINISHED'}
 
         if self.mode == 'DUP_MIRROR':
-            obj = active_obj_mesh(context)
-            if not obj:
-                self.report({'WARNING'}, "Select a mesh object with shapekeys.")
-                return {'CANCELLED'}
-
             ks = list(iter_keyblocks(obj))
             if not ks:
                 self.report({'WARNING'}, "No shapekeys to mirror.")
@@ -1051,79 +2990,51 @@ class SKO_OT_ShapeKeyAdd(Operator):
                 self.report({'INFO'}, "No selected shapekeys to mirror.")
                 return {'CANCELLED'}
 
-            values_cache = {k.name: float(getattr(k, "value", 0.0)) for k in ks}
-
-            try:
-                bpy.ops.object.mode_set(mode='OBJECT')
-            except Exception:
-                pass
-
-            created = 0
             prefix = (self.key_name or "").strip()
             suffix = self.duplicate_suffix
+            if not prefix and not suffix:
+                suffix = "_Mirror"
+            names = [f"{prefix}{src.name}{suffix}" for src in targets]
 
-            for src in targets:
-                for k in ks:
-                    try: k.value = 0.0
-                    except: pass
-                try:
-                    src.value = 1.0
-                except: pass
-
-                bpy.ops.object.mode_set(mode='OBJECT')
-                bpy.ops.object.shape_key_add(from_mix=True)
-
-                new_idx = len(obj.data.shape_keys.key_blocks) - 1
-                obj.active_shape_key_index = new_idx
-                new_k = obj.data.shape_keys.key_blocks[new_idx]
-
-                for k in ks:
-                    try: k.value = 0.0
-                    except: pass
-
+            if self.use_topology:
+                # Topology mirroring walks mesh connectivity; leave that to Blender.
                 try:
-                    bpy.ops.object.shape_key_mirror(use_topology=self.use_topology)
+                    new_keys = _sko_create_keys(obj, names, (_kb_read_co(src) for src in targets), like=targets)
                 except Exception as e:
-                    self.report({'WARNING'}, f"Mirror failed on '{new_k.name}': {e}")
-
-                prefix = (self.key_name or "").strip()
-                suffix = self.duplicate_suffix
-                if not prefix and not suffix:
-                    suffix = "_Mirror"
-                new_k.name = f"{prefix}{src.name}{suffix}"
-                it = ensure_item_by_name(new_k.name, create=True)
-                if it: it.selected = True
-                created += 1
+                    self.report({'ERROR'}, f"Duplicate failed: {e}")
+                    return {'CANCELLED'}
 
+                sk_blocks = obj.data.shape_keys.key_blocks
+                for new_k in new_keys:
+                    obj.active_shape_key_index = sk_blocks.find(new_k.name)
+                    try:
+                        bpy.ops.object.shape_key_mirror(use_topology=True)
+                    except Exception as e:
+                        self.report({'WARNING'}, f"Mirror failed on '{new_k.name}': {e}")
+            else:
+                basis_co = _kb_read_co(ks[0])
+                mirror = _sko_mirror_map(obj, basis_co, max(0.0, self.mirror_tolerance))
+                unmatched = int(np.count_nonzero(mirror[1]))
                 try:
-                    new_k.slider_min = float(getattr(src, "slider_min", 0.0))
-                    new_k.slider_max = float(getattr(src, "slider_max", 1.0))
-                except:
-                    pass
-
-                for k in ks:
-                    try: k.value = values_cache.get(k.name, 0.0)
-                    except: pass
-
-            try:
-                bpy.context.view_layer.update()
-                for win in bpy.context.window_manager.windows:
-                    for area in win.screen.areas:
-                        if area.type in {'PROPERTIES', 'VIEW_3D'}:
-                            area.tag_redraw()
-            except Exception:
-                pass
+                    new_keys = _sko_create_keys(
+                        obj, names,
+                        (_sko_mirror_co(_kb_read_co(src), basis_co, mirror) for src in targets),
+                        like=targets,
+                    )
+                except Exception as e:
+                    self.report({'ERROR'}, f"Duplicate failed: {e}")
+                    return {'CANCELLED'}
+                if unmatched:
+                    self.report(
+                        {'WARNING'},
+                        f"{unmatched} vertices have no mirror partner within tolerance and were left unchanged."
+                    )
 
-            self.key_name = ""
-            self.report({'INFO'}, f"Duplicated & mirrored {created} shapekey(s).")
+            _finalize(new_keys)
+            self.report({'INFO'}, f"Duplicated & mirrored {len(new_keys)} shapekey(s).")
             return {'FINISHED'}
 
-        elif self.mode == 'SPLIT':
-            obj = active_obj_mesh(context)
-            if not obj:
-                self.report({'WARNING'}, "Select a mesh object with shapekeys.")
-                return {'CANCELLED'}
-
+        if self.mode == 'SPLIT':
             ks = list(iter_keyblocks(obj))
             if not ks:
                 self.report({'WARNING'}, "Object has no shapekeys to split.")
@@ -1138,108 +3049,63 @@ class SKO_OT_ShapeKeyAdd(Operator):
                 self.report({'WARNING'}, "Select one or more shapekeys (non-Basis) or set an active shapekey.")
                 return {'CANCELLED'}
 
-            values_cache = {k.name: float(getattr(k, "value", 0.0)) for k in ks}
-
             left_tok  = (self.split_left_token  or "").strip() or "_L"
             right_tok = (self.split_right_token or "").strip() or "_R"
 
-            created = 0
-            try:
-                try:
-                    bpy.ops.object.mode_set(mode='OBJECT')
-                except Exception:
-                    pass
-
-                for src in targets:
-                    for k in ks:
-                        try: k.value = 0.0
-                        except Exception: pass
-                    try:
-                        src.value = 1.0
-                    except Exception:
-                        pass
-
-                    bpy.ops.object.shape_key_add(from_mix=True)
-                    k_left = obj.data.shape_keys.key_blocks[-1]
-                    obj.active_shape_key_index = len(obj.data.shape_keys.key_blocks) - 1
-
-                    try:
-                        k_left.value = 0.0
-                    except Exception:
-                        pass
-
-                    bpy.ops.object.shape_key_add(from_mix=True)
-                    k_right = obj.data.shape_keys.key_blocks[-1]
-                    obj.active_shape_key_index = len(obj.data.shape_keys.key_blocks) - 1
-
-                    k_left.name  = f"{src.name}{left_tok}"
-                    k_right.name = f"{src.name}{right_tok}"
-
-                    try:
-                        for nk in (k_left, k_right):
-                            nk.slider_min = float(getattr(src, "slider_min", 0.0))
-                            nk.slider_max = float(getattr(src, "slider_max", 1.0))
-                    except Exception:
-                        pass
-
-                    for k in iter_keyblocks(obj):
-                        try: k.value = 0.0
-                        except Exception: pass
-
-                    changed_L = _sko_split_keyblock_half(
-                        obj, k_left,
-                        axis="X",
-                        eps=max(0.0, self.split_eps),
-                        keep_side='LEFT',
-                        use_median_plane=self.use_median_plane
+            # Basis and split weights are shared by both halves of every target.
+            basis_co = _kb_read_co(ks[0])
+            w_left, w_right = _sko_split_weights(
+                obj, basis_co,
+                axis=self.split_axis,
+                eps=max(0.0, self.split_eps),
+                falloff=self.split_falloff,
+                band=max(0.0, self.split_band),
+                use_median_plane=self.use_median_plane,
+                plane_co=self.split_plane_co,
+                plane_no=self.split_plane_no,
+            )
+
+            new_keys = []
+            split = []
+            for src in targets:
+                # Halves are split relative to the key src is relative to.
+                ref = src.relative_key or ks[0]
+                ref_co = basis_co if ref == ks[0] else _kb_read_co(ref)
+                src_co = _kb_read_co(src)
+                co_left, changed_L = _sko_weighted_delta(src_co, ref_co, w_left)
+                co_right, changed_R = _sko_weighted_delta(src_co, ref_co, w_right)
+
+                if changed_L == 0 or changed_R == 0:
+                    self.report(
+                        {'WARNING'},
+                        f"Split '{src.name}' affected L:{changed_L} / R:{changed_R} vertices. "
+                        f"Check threshold or the model’s symmetry vs the split plane."
                     )
-                    changed_R = _sko_split_keyblock_half(
-                        obj, k_right,
-                        axis="X",
-                        eps=max(0.0, self.split_eps),
-                        keep_side='RIGHT',
-                        use_median_plane=self.use_median_plane
+
+                try:
+                    new_keys += _sko_create_keys(
+                        obj,
+                        [f"{src.name}{left_tok}", f"{src.name}{right_tok}"],
+                        [co_left, co_right],
+                        like=[src, src],
                     )
+                except Exception as e:
+                    self.report({'ERROR'}, f"Split failed on '{src.name}': {e}")
+                    break
+                split.append(src)
 
-                    if changed_L == 0 or changed_R == 0:
-                        self.report(
-                            {'WARNING'},
-                            f"Split '{src.name}' affected L:{changed_L} / R:{changed_R} vertices. "
-                            f"Check threshold or the model’s symmetry vs X=0."
-                        )
-
-                    it = ensure_item_by_name(k_left.name,  create=True);  setattr(it, "selected", True)  if it else None
-                    it = ensure_item_by_name(k_right.name, create=True);  setattr(it, "selected", True) if it else None
-
-                    created += 2
-
-                    if not self.keep_original:
-                        try:
-                            idx = list(obj.data.shape_keys.key_blocks).index(src)
-                            obj.active_shape_key_index = idx
-                            bpy.ops.object.shape_key_remove(all=False)
-                        except Exception:
-                            self.report({'WARNING'}, f"Could not remove original key '{src.name}'.")
-
-                self.report({'INFO'}, f"Split {len(targets)} key(s) → created {created}.")
-                return {'FINISHED'}
-
-            finally:
-                sk = getattr(getattr(obj.data, 'shape_keys', None), 'key_blocks', None)
-                if sk:
-                    for kb in sk:
-                        try:
-                            kb.value = float(values_cache.get(kb.name, 0.0))
-                        except Exception:
-                            pass
+            # Only originals that were actually split may go; the rest are untouched.
+            if split and not self.keep_original:
                 try:
-                    bpy.context.view_layer.update()
-                    for win in bpy.context.window_manager.windows:
-                        for area in win.screen.areas:
-                            if area.type in {'PROPERTIES', 'VIEW_3D'}:
-                                area.tag_redraw()
+                    _sko_remove_keys(obj, split)
                 except Exception:
-                    pass
+                    self.report({'WARNING'}, "Could not remove the original key(s).")
+
+            _finalize(new_keys)
+            if not split:
+                return {'CANCELLED'}
+            self.report({'INFO'}, f"Split {len(split)} key(s) → created {len(new_keys)}.")
+            return {'FINISHED'}
 
         # MIX_SELECTED
         ks = list(iter_keyblocks(obj))
@@ -1249,15 +3115,13 @@ class SKO_OT_ShapeKeyAdd(Operator):
 
         pool = filtered_keys(context, obj) if self.visible_only else ks
 
-        values_cache = {k.name: float(getattr(k, "value", 0.0)) for k in ks}
-
         include = []
         for k in pool:
             if is_basis_key(obj, k):
                 continue
             if not get_sel(k):
                 continue
-            if not self.include_zero and values_cache.get(k.name, 0.0) == 0.0:
+            if not self.include_zero and k.value == 0.0:
                 continue
             include.append(k)
 
@@ -1265,39 +3129,28 @@ class SKO_OT_ShapeKeyAdd(Operator):
             self.report({'INFO'}, "No selected (and eligible) shapekeys to combine.")
             return {'CANCELLED'}
 
-        for k in ks:
-            try:
-                k.value = 0.0
-            except Exception:
-                pass
-
-        for k in include:
+        if getattr(obj.data.shape_keys, "use_relative", True):
             try:
-                k.value = values_cache.get(k.name, 0.0)
-            except Exception:
-                pass
-
-        try:
-            bpy.ops.object.shape_key_add(from_mix=True)
-        except Exception as e:
-            for k in ks:
-                try:
-                    k.value = values_cache.get(k.name, 0.0)
-                except Exception:
-                    pass
-            self.report({'ERROR'}, f"Could not create shapekey from selected mix: {e}")
-            return {'CANCELLED'}
-
-        new_key = _finalize_new_key()
-
-        for k in ks:
+                new_keys = _sko_create_keys(obj, [self.key_name.strip()], [_sko_eval_mix(obj, include)])
+            except Exception as e:
+                self.report({'ERROR'}, f"Could not create shapekey from selected mix: {e}")
+                return {'CANCELLED'}
+        else:
+            # Absolute keys are interpolated along eval_time; let Blender bake those.
+            sk_blocks = obj.data.shape_keys.key_blocks
             try:
-                k.value = values_cache.get(k.name, 0.0)
-            except Exception:
-                pass
+                with _SKOStackSnapshot(obj) as snap:
+                    values = np.zeros_like(snap.value)
+                    idx = [sk_blocks.find(k.name) for k in include]
+                    values[idx] = snap.value[idx]
+                    snap.write("value", values)
+                    new_keys = _sko_create_keys(obj, [self.key_name.strip()], from_mix=True)
+            except Exception as e:
+                self.report({'ERROR'}, f"Could not create shapekey from selected mix: {e}")
+                return {'CANCELLED'}
 
-        self.report({'INFO'}, f"Created '{new_key.name if new_key else '(unknown)'}' from {len(include)} selected key(s).")
-        self.key_name = ""
+        _finalize(new_keys)
+        self.report({'INFO'}, f"Created '{new_keys[0].name}' from {len(include)} selected key(s).")
         return {'FINISHED'}
 
 class SKO_OT_ShapeKeyDelete(bpy.types.Operator):
@@ -1366,23 +3219,20 @@ class SKO_OT_ShapeKeyDelete(bpy.types.Operator):
                 self.report({'INFO'}, "No shapekeys to delete.")
                 return {'CANCELLED'}
 
-        indices = []
-        for n in names:
-            kb = sk.get(n)
-            if kb:
-                idx = list(sk).index(kb)
-                if idx > 0:
-                    indices.append(idx)
+        try:
+            bpy.ops.object.mode_set(mode='OBJECT')
+        except Exception:
+            pass
 
-        indices.sort(reverse=True)
-        for idx in indices:
-            obj.active_shape_key_index = idx
-            try:
-                bpy.ops.object.shape_key_remove(all=False)
-            except Exception:
-                pass
+        wanted = set(names)
+        doomed = [kb for kb in sk[1:] if kb.name in wanted]
+        try:
+            removed = _sko_remove_keys(obj, doomed)
+        except Exception as e:
+            self.report({'ERROR'}, f"Could not delete shapekeys: {e}")
+            return {'CANCELLED'}
 
-        self.report({'INFO'}, f"Deleted {len(indices)} shapekey(s).")
+        self.report({'INFO'}, f"Deleted {len(removed)} shapekey(s).")
         return {'FINISHED'}
 
 
@@ -1411,21 +3261,22 @@ class SKO_OT_ToggleSelect(Operator):
 
         props = context.scene.shapekey_organizer
 
-        idx_of = {k.name: i for i, k in enumerate(ks)}
-        if self.key_name not in idx_of:
+        current_idx = ks.find(self.key_name)
+        if current_idx < 0:
             return {'CANCELLED'}
-        current_idx = idx_of[self.key_name]
 
-        visible_names = [k.name for k in filtered_keys(context, obj)]
-        visible_set = {idx_of[n] for n in visible_names if n in idx_of}
+        sk = obj.data.shape_keys
+        visible = np.zeros(len(ks), dtype=bool)
+        visible[list(filter_result(context, obj)[0])] = True
+        mask = selection_mask(sk).copy()
 
-        if self.range_mode and props.anchor_index >= 0 and props.anchor_index in visible_set and current_idx in visible_set:
-            a, b = sorted((props.anchor_index, current_idx))
-            for i in range(a, b + 1):
-                if i in visible_set:
-                    set_sel(ks[i], True)
+        anchor = props.anchor_index
+        if self.range_mode and 0 <= anchor < len(ks) and visible[anchor] and visible[current_idx]:
+            a, b = sorted((anchor, current_idx))
+            mask[a:b + 1] |= visible[a:b + 1]
         else:
-            set_sel(ks[current_idx], not get_sel(ks[current_idx]))
+            mask[current_idx] = not mask[current_idx]
+        set_selection_mask(sk, mask)
 
         props.anchor_index = current_idx
         return {'FINISHED'}
@@ -1434,21 +3285,45 @@ class SKO_OT_ToggleSelect(Operator):
 class SKO_OT_SyncState(Operator):
     bl_idname = "shapekey_organizer.sync_state"
     bl_label = "Refresh"
-    bl_description = "Scan current object and create state entries for all shapekeys (safe)"
+    bl_description = (
+        "Drop the add-on's cached view of the shapekeys (IDs, selection, groups, filters) "
+        "and rebuild it from the current data"
+    )
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
         obj = active_obj_mesh(context)
-        if not obj:
+        sk = getattr(getattr(obj, 'data', None), 'shape_keys', None) if obj else None
+        if not sk:
             self.report({'WARNING'}, "Select a mesh object with shapekeys.")
             return {'CANCELLED'}
-        created = 0
-        for k in iter_keyblocks(obj):
-            if not find_item_by_name(k.name):
-                it = ensure_item_by_name(k.name, create=True)
-                if it:
-                    created += 1
-        self.report({'INFO'}, f"State synced for {created} keys.")
+        _sko_invalidate_caches(None)
+        entry = _sel_entry(sk)
+        if sk.library is None:
+            _sel_store(sk, entry)
+        self.report({'INFO'}, f"Refreshed state for {len(entry['ids'])} keys.")
+        return {'FINISHED'}
+
+
+class SKO_OT_CleanupState(Operator):
+    bl_idname = "shapekey_organizer.cleanup_state"
+    bl_label = "Clean Up"
+    bl_description = "Remove stored state for shapekeys that no longer exist (also runs automatically on save)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        removed, reclaimed = 0, 0
+        for sk in bpy.data.shape_keys:
+            if sk.library is not None:
+                continue
+            _SWEEP_SIG.pop(sk.as_pointer(), None)
+            r, b = sweep_state_items(sk)
+            removed += r
+            reclaimed += b
+        if removed:
+            self.report({'INFO'}, f"Removed {removed} stale state entries (~{reclaimed / 1024:.1f} KB).")
+        else:
+            self.report({'INFO'}, "No stale state entries found.")
         return {'FINISHED'}
 
 
@@ -1463,10 +3338,10 @@ class SKO_OT_SelectAll(Operator):
         if not obj:
             self.report({'WARNING'}, "Select a mesh object with shapekeys.")
             return {'CANCELLED'}
-        for k in filtered_keys(context, obj):
-            if is_basis_key(obj, k):
-                continue
-            set_sel(k, True)
+        sk = obj.data.shape_keys
+        mask = selection_mask(sk).copy()
+        mask[_sko_visible_indices(context, obj, skip_basis=True)] = True
+        set_selection_mask(sk, mask)
         return {'FINISHED'}
 
 
@@ -1481,8 +3356,10 @@ class SKO_OT_SelectNone(Operator):
         if not obj:
             self.report({'WARNING'}, "Select a mesh object with shapekeys.")
             return {'CANCELLED'}
-        for k in filtered_keys(context, obj):
-            set_sel(k, False)
+        sk = obj.data.shape_keys
+        mask = selection_mask(sk).copy()
+        mask[_sko_visible_indices(context, obj)] = False
+        set_selection_mask(sk, mask)
         return {'FINISHED'}
 
 
@@ -1497,17 +3374,18 @@ class SKO_OT_SelectInvert(Operator):
         if not obj:
             self.report({'WARNING'}, "Select a mesh object with shapekeys.")
             return {'CANCELLED'}
-        for k in filtered_keys(context, obj):
-            if is_basis_key(obj, k):
-                continue
-            set_sel(k, not get_sel(k))
+        sk = obj.data.shape_keys
+        mask = selection_mask(sk).copy()
+        idx = _sko_visible_indices(context, obj, skip_basis=True)
+        mask[idx] = ~mask[idx]
+        set_selection_mask(sk, mask)
         return {'FINISHED'}
 
 
 class SKO_OT_AssignGroup(Operator):
     bl_idname = "shapekey_organizer.assign_group"
     bl_label = "Assign Group"
-    bl_description = "Assign the current Group field value to selected shapekeys"
+    bl_description = "Add the current Group field value to the tags of selected shapekeys"
     bl_options = {'REGISTER', 'UNDO'}
 
     group: StringProperty(name="Group", description="Group name to assign to selected keys")
@@ -1520,29 +3398,17 @@ class SKO_OT_AssignGroup(Operator):
 
         props = context.scene.shapekey_organizer
 
-        gname = (self.group or "").strip() or (props.group_search or "").strip()
+        gname = group_path(self.group) or group_path(props.group_search)
         if not gname:
             self.report({'WARNING'}, "Enter a group name first.")
             return {'CANCELLED'}
 
-        all_keys = list(iter_keyblocks(obj))
-        selected_targets = [k for k in all_keys if get_sel(k) and not is_basis_key(obj, k)]
-
-        if not selected_targets:
-            ak = getattr(obj, "active_shape_key", None)
-            if ak and not is_basis_key(obj, ak):
-                targets = [ak]
-            else:
-                targets = []
-        else:
-            targets = selected_targets
-
+        targets = _selected_key_ids(obj) if iter_keyblocks(obj) else []
         if not targets:
             self.report({'INFO'}, "No shapekeys to assign (Basis is ignored).")
             return {'CANCELLED'}
 
-        for k in targets:
-            set_group(k, gname)
+        tag_ids(obj.data.shape_keys, targets, gname)
 
         ensure_group(context, gname)
 
@@ -1562,19 +3428,23 @@ class SKO_OT_AssignGroup(Operator):
 class SKO_OT_ClearGroup(Operator):
     bl_idname = "shapekey_organizer.clear_group"
     bl_label = "Clear Group"
-    bl_description = "Clear the group tag from selected shapekeys"
+    bl_description = "Clear the group tags from selected shapekeys"
     bl_options = {'REGISTER', 'UNDO'}
 
+    group: StringProperty(name="Group", description="Only remove this tag (all tags if empty)")
+
     def execute(self, context):
         obj = active_obj_mesh(context)
         if not obj:
             self.report({'WARNING'}, "Select a mesh object with shapekeys.")
             return {'CANCELLED'}
+        sk = getattr(obj.data, 'shape_keys', None)
         count = 0
-        for k in iter_keyblocks(obj):
-            if get_sel(k):
-                set_group(k, "")
-                count += 1
+        if sk:
+            stack = _stack_entry(sk)
+            ids = [stack["ids"][j] for j in np.flatnonzero(selection_mask(sk))]
+            count = len(ids)
+            untag_ids(sk, ids, group_path(self.group))
         self.report({'INFO'}, f"Cleared group on {count} keys.")
         return {'FINISHED'}
 
@@ -1609,11 +3479,7 @@ class SKO_OT_PrefixSuffix(Operator):
 
         count = 0
         for k in targets:
-            it = ensure_item_by_name(k.name, create=True)
-            new_name = f"{pre}{k.name}{suf}"
-            k.name = new_name
-            if it:
-                it.key_name = new_name
+            rename_key(k, f"{pre}{k.name}{suf}")
             count += 1
 
         self.report({'INFO'}, f"Renamed {count} key(s).")
@@ -1645,10 +3511,7 @@ class SKO_OT_FindReplace(Operator):
                 if props.affect_only_selected and not get_sel(k):
                     continue
                 if find in k.name:
-                    it = ensure_item_by_name(k.name, create=True)
-                    new_name = k.name.replace(find, repl)
-                    k.name = new_name
-                    it.key_name = new_name
+                    rename_key(k, k.name.replace(find, repl))
                     count += 1
         else:
             pattern = re.compile(re.escape(find), re.IGNORECASE)
@@ -1656,10 +3519,7 @@ class SKO_OT_FindReplace(Operator):
                 if props.affect_only_selected and not get_sel(k):
                     continue
                 if pattern.search(k.name):
-                    it = ensure_item_by_name(k.name, create=True)
-                    new_name = pattern.sub(repl, k.name)
-                    k.name = new_name
-                    it.key_name = new_name
+                    rename_key(k, pattern.sub(repl, k.name))
                     count += 1
 
         self.report({'INFO'}, f"Renamed {count} keys.")
@@ -1684,10 +3544,7 @@ class SKO_OT_AutoNumber(Operator):
         for k in iter_keyblocks(obj):
             if props.affect_only_selected and not get_sel(k):
                 continue
-            it = ensure_item_by_name(k.name, create=True)
-            new_name = f"{k.name} {str(i).zfill(pad)}"
-            k.name = new_name
-            it.key_name = new_name
+            rename_key(k, f"{k.name} {str(i).zfill(pad)}")
             i += 1
             count += 1
         self.report({'INFO'}, f"Auto-numbered {count} keys.")
@@ -1715,7 +3572,7 @@ class SKO_OT_Sort(Operator):
 
         props = context.scene.shapekey_organizer
 
-        visible = filtered_keys(context, obj)
+        visible = [k for k in filtered_keys(context, obj) if not is_basis_key(obj, k)]
 
         targets = [k for k in visible if get_sel(k)] if props.affect_only_selected else list(visible)
         if not targets:
@@ -1729,38 +3586,39 @@ class SKO_OT_Sort(Operator):
             ordered = sorted(targets, key=lambda k: k.name.lower(), reverse=reverse)
             order_name = "Name A→Z" if not reverse else "Name Z→A"
         else:
-            glist = [g.name for g in all_groups(context)]
-            gprio = {name: i for i, name in enumerate(glist)}
+            tree = group_tree(context.scene)
 
             def sort_key(k):
-                gname = get_group(k)
-                gindex = gprio.get(gname, 999999)  # ungrouped last
+                rank = group_rank(tree, get_group(k))
+                gindex = 999999 if rank is None else rank  # ungrouped last
                 return (gindex, k.name.lower())
 
             ordered = sorted(targets, key=sort_key)
             order_name = "Group List → Name"
 
-        def index_of(name: str) -> int:
-            for i, kb in enumerate(obj.data.shape_keys.key_blocks):
-                if kb.name == name:
-                    return i
-            return -1
+        # Sorted keys go right under the Basis; everything else keeps its relative order below them.
+        t0 = time.perf_counter()
+        vis_idx, vis_names = filter_result(context, obj)
+        index_of = dict(zip(vis_names, vis_idx))
+        current = list(range(len(ks)))
+        ordered_idx = [index_of[k.name] for k in ordered]
+        ordered_set = set(ordered_idx)
+        final = [0] + ordered_idx + [i for i in current[1:] if i not in ordered_set]
+        plan = _sko_plan_reorder(current, final, obj.data.shape_keys.use_relative)
+        if plan is None:
+            self.report({'ERROR'}, "Could not plan the key moves; the order was left unchanged.")
+            return {'CANCELLED'}
 
         try:
             bpy.ops.object.mode_set(mode='OBJECT')
         except Exception:
             pass
 
-        for k in reversed(ordered):
-            i = index_of(k.name)
-            if i < 0:
-                continue
-            obj.active_shape_key_index = i
-            bpy.ops.object.shape_key_move(type='TOP')
-            while obj.active_shape_key_index == 0:
-                bpy.ops.object.shape_key_move(type='DOWN')
+        active = obj.active_shape_key_index
+        moves = _sko_apply_reorder_plan(obj, plan, final.index(active) if 0 <= active < len(final) else None)
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
 
-        self.report({'INFO'}, f"Sorted {len(ordered)} keys: {order_name}.")
+        self.report({'INFO'}, f"Sorted {len(ordered)} keys: {order_name} ({moves} moves, {elapsed_ms:.0f} ms).")
         return {'FINISHED'}
 
 
@@ -1777,6 +3635,11 @@ class SKO_OT_MoveSelected(Operator):
         items=[('TOP', 'Top', ''), ('UP', 'Up', ''), ('DOWN', 'Down', ''), ('BOTTOM', 'Bottom', '')],
         default='TOP'
     )
+    amount: IntProperty(
+        name="Amount",
+        description="How many positions Up/Down moves the selected keys",
+        default=1, min=1,
+    )
 
     def execute(self, context):
         obj = active_obj_mesh(context)
@@ -1792,24 +3655,30 @@ class SKO_OT_MoveSelected(Operator):
             self.report({'INFO'}, "No keys to move.")
             return {'CANCELLED'}
 
-        ks = list(iter_keyblocks(obj))
-        name_to_idx = {k.name: i for i, k in enumerate(ks)}
-        idxs = [name_to_idx[k.name] for k in targets if k.name in name_to_idx]
+        ks = obj.data.shape_keys.key_blocks
+        vis_idx, vis_names = filter_result(context, obj)
+        index_of = dict(zip(vis_names, vis_idx))
+        selected = {index_of[k.name] if k.name in index_of else ks.find(k.name) for k in targets}
 
-        if self.direction in {'TOP', 'UP'}:
-            order = sorted(idxs)
-        else:
-            order = sorted(idxs, reverse=True)
+        current = list(range(len(ks)))
+        final = _sko_block_move_order(len(ks), selected, self.direction, max(1, self.amount))
+        plan = _sko_plan_reorder(current, final, obj.data.shape_keys.use_relative)
+        if plan is None:
+            self.report({'ERROR'}, "Could not plan the key moves; the order was left unchanged.")
+            return {'CANCELLED'}
 
-        for i in order:
-            obj.active_shape_key_index = i
-            if self.direction == 'TOP':
-                move_active_to_top_below_basis(obj)
-            else:
-                bpy.ops.object.shape_key_move(type=self.direction)
-                if self.direction == 'UP':
-                    _ensure_active_not_basis(obj)
-        self.report({'INFO'}, f"Moved {len(order)} keys {self.direction.lower()}.")
+        try:
+            bpy.ops.object.mode_set(mode='OBJECT')
+        except Exception:
+            pass
+
+        active = obj.active_shape_key_index
+        moves = _sko_apply_reorder_plan(obj, plan, final.index(active) if 0 <= active < len(final) else None)
+
+        label = self.direction.lower()
+        if self.direction in {'UP', 'DOWN'} and self.amount > 1:
+            label = f"{label} by {self.amount}"
+        self.report({'INFO'}, f"Moved {len(selected)} keys {label} ({moves} moves).")
         return {'FINISHED'}
 
 
@@ -1830,17 +3699,11 @@ class SKO_OT_ToggleMute(Operator):
         if not obj:
             self.report({'WARNING'}, "Select a mesh object with shapekeys.")
             return {'CANCELLED'}
-        count = 0
-        for k in iter_keyblocks(obj):
-            if not get_sel(k):
-                continue
-            if self.state == 'TOGGLE':
-                k.mute = not k.mute
-            elif self.state == 'ON':
-                k.mute = True
-            else:
-                k.mute = False
-            count += 1
+        ks = iter_keyblocks(obj)
+        if not ks:
+            self.report({'INFO'}, "No shapekeys to update.")
+            return {'CANCELLED'}
+        count = _sko_batch_edit(obj, selection_mask(obj.data.shape_keys), mute=self.state)
         self.report({'INFO'}, f"Updated mute on {count} keys.")
         return {'FINISHED'}
 
@@ -1884,21 +3747,7 @@ class SKO_OT_SetSliderRange(Operator):
             self.report({'INFO'}, "No visible shapekeys to update.")
             return {'CANCELLED'}
 
-        count = 0
-        for k in targets:
-            try:
-                k.slider_min = min_v
-                k.slider_max = max_v
-            except Exception:
-                continue
-            try:
-                if k.value < min_v:
-                    k.value = min_v
-                elif k.value > max_v:
-                    k.value = max_v
-            except Exception:
-                pass
-            count += 1
+        count = _sko_batch_edit(obj, _sko_key_mask(obj, targets), slider_range=(min_v, max_v))
         self.report({'INFO'}, f"Updated slider ranges on {count} keys.")
         return {'FINISHED'}
 
@@ -1925,25 +3774,9 @@ class SKO_OT_ResetValues(Operator):
             self.report({'INFO'}, "No visible shapekeys to reset.")
             return {'CANCELLED'}
 
-        default_min, default_max = 0.0, 1.0
-        ranges_reset = 0
-        values_reset = 0
-
-        for k in targets:
-            try:
-                k.slider_min = default_min
-                k.slider_max = default_max
-                ranges_reset += 1
-            except Exception:
-                pass
-
-            if is_basis_key(obj, k):
-                continue
-            try:
-                k.value = 0.0
-                values_reset += 1
-            except Exception:
-                pass
+        mask = _sko_key_mask(obj, targets)
+        mask[0] = False  # never the Basis
+        count = _sko_batch_edit(obj, mask, slider_range=(0.0, 1.0), value=0.0)
 
         props.slider_min = 0.0
         props.slider_max = 1.0
@@ -1956,7 +3789,7 @@ class SKO_OT_ResetValues(Operator):
         except Exception:
             pass
 
-        self.report({'INFO'}, f"Reset ranges on {ranges_reset} keys and values on {values_reset} keys.")
+        self.report({'INFO'}, f"Reset ranges and values on {count} keys.")
         return {'FINISHED'}
 
 
@@ -1979,7 +3812,7 @@ class SKO_OT_GroupAdd(Operator):
         scn = context.scene
         props = scn.shapekey_organizer
 
-        name = (self.group or props.group_search or "").strip()
+        name = group_path(self.group or props.group_search)
         if not name:
             self.report({'WARNING'}, "Enter a group name to add.")
             return {'CANCELLED'}
@@ -1996,21 +3829,10 @@ class SKO_OT_GroupAdd(Operator):
 
         assigned = 0
         obj = active_obj_mesh(context)
-        if obj:
-            sk = getattr(getattr(obj.data, 'shape_keys', None), 'key_blocks', None)
-            all_keys = list(sk) if sk else []
-    
-            selected = [k for k in all_keys if get_sel(k) and not is_basis_key(obj, k)]
-            if selected:
-                targets = selected
-            else:
-                idx = getattr(obj, "active_shape_key_index", -1)
-                ak = sk[idx] if (sk and 0 <= idx < len(sk)) else None
-                targets = [ak] if (ak and not is_basis_key(obj, ak)) else []
-    
-            for k in targets:
-                set_group(k, name)
-                assigned += 1
+        if obj and iter_keyblocks(obj):
+            targets = _selected_key_ids(obj)
+            tag_ids(obj.data.shape_keys, targets, name)
+            assigned = len(targets)
 
         try:
             for area in context.screen.areas:
@@ -2043,14 +3865,13 @@ class SKO_OT_GroupRemove(Operator):
 
         obj = active_obj_mesh(context)
         removed_count = 0
-        if obj:
-            for k in iter_keyblocks(obj):
-                if get_group(k) == group_name:
-                    set_group(k, "")
-                    removed_count += 1
+        if obj and iter_keyblocks(obj):
+            sk = obj.data.shape_keys
+            removed_count = untag_ids(sk, list(group_members(sk, group_name)), group_name)
 
         groups.remove(idx)
         scn.sko_groups_index = min(idx, len(groups) - 1)
+        bump_generation("group_list")
 
         self.report({'INFO'}, f"Removed group '{group_name}' from list and cleared from {removed_count} keys.")
         for area in context.screen.areas:
@@ -2062,7 +3883,7 @@ class SKO_OT_GroupRemove(Operator):
 class SKO_OT_GroupMove(Operator):
     bl_idname = "shapekey_organizer.group_move"
     bl_label = "Move"
-    bl_description = "Reorder groups in the list"
+    bl_description = "Move the selected group above/below its neighbour under the same parent"
     bl_options = {'REGISTER', 'UNDO'}
 
     direction: EnumProperty(items=[('UP','Up',''),('DOWN','Down','')], default='UP')
@@ -2073,18 +3894,25 @@ class SKO_OT_GroupMove(Operator):
         groups = scn.sko_groups
         if idx < 0 or idx >= len(groups):
             return {'CANCELLED'}
-        new_idx = idx - 1 if self.direction == 'UP' else idx + 1
-        if new_idx < 0 or new_idx >= len(groups):
+        parent = group_tree(scn)["parent"]
+        siblings = [i for i in range(len(groups)) if parent[i] == parent[idx]]
+        at = siblings.index(idx)
+        at += -1 if self.direction == 'UP' else 1
+        if at < 0 or at >= len(siblings):
             return {'CANCELLED'}
+        # Moving onto the neighbour's list slot swaps the two siblings and
+        # keeps every other entry in its relative order.
+        new_idx = siblings[at]
         groups.move(idx, new_idx)
         scn.sko_groups_index = new_idx
+        bump_generation("group_list")
         return {'FINISHED'}
 
 
 class SKO_OT_GroupSelectKeys(Operator):
     bl_idname = "shapekey_organizer.group_select_keys"
     bl_label = "Select Keys"
-    bl_description = "Select all keys tagged with the selected group (ignores Basis)"
+    bl_description = "Select all keys tagged with the selected group or a group nested under it (ignores Basis)"
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
@@ -2097,11 +3925,16 @@ class SKO_OT_GroupSelectKeys(Operator):
         if idx < 0 or idx >= len(groups):
             return {'CANCELLED'}
         gname = groups[idx].name
-        for k in iter_keyblocks(obj):
-            if is_basis_key(obj, k):
-                continue
-            if get_group(k) == gname:
-                set_sel(k, True)
+        sk = getattr(obj.data, 'shape_keys', None)
+        if not sk:
+            return {'CANCELLED'}
+        # Nested groups are included: selecting "Face" also selects "Face/Mouth" keys.
+        members = tag_filter_indices(sk, gname)
+        members = members[members != 0]
+        if members.size:
+            mask = selection_mask(sk).copy()
+            mask[members] = True
+            set_selection_mask(sk, mask)
         return {'FINISHED'}
 
 
@@ -2170,7 +4003,12 @@ class SKO_PT_Main(Panel):
 
         box = layout.box()
         row = box.row(align=True)
-        row.prop(props, 'search', text="Search")
+        query = props.search.strip()
+        sub = row.row(align=True)
+        sub.alert = bool(query) and props.search_mode in {'GLOB', 'REGEX'} \
+            and search_pattern(query, props.search_mode) is None
+        sub.prop(props, 'search', text="Search")
+        row.prop(props, 'search_mode', text="")
         layout.separator()
         row.operator("shapekey_organizer.toggle_show_only",
             text="", icon=('SOLO_ON' if obj.show_only_shape_key else 'SOLO_OFF'), depress=state_solo)
@@ -2188,6 +4026,7 @@ class SKO_PT_Main(Panel):
         controls.operator("shapekey_organizer.select_none", icon='CHECKBOX_DEHLT')
         controls.operator("shapekey_organizer.select_invert", icon='ARROW_LEFTRIGHT')
         controls.operator("shapekey_organizer.sync_state", icon='FILE_REFRESH')
+        controls.operator("shapekey_organizer.cleanup_state", text="", icon='BRUSH_DATA')
         box.label(text="Tip: Shift-click a checkbox to select a range.")
 
         layout.separator()
@@ -2200,9 +4039,14 @@ class SKO_PT_Main(Panel):
         row.operator("shapekey_organizer.sort", icon='SORTALPHA')
         row = sm.row(align=True)
         row.operator("shapekey_organizer.move_selected", text="Top", icon="TRIA_UP_BAR").direction = 'TOP'
-        row.operator("shapekey_organizer.move_selected", text="Up", icon="TRIA_UP").direction = 'UP'
-        row.operator("shapekey_organizer.move_selected", text="Down", icon="TRIA_DOWN").direction = 'DOWN'
+        op = row.operator("shapekey_organizer.move_selected", text="Up", icon="TRIA_UP")
+        op.direction = 'UP'
+        op.amount = props.move_amount
+        op = row.operator("shapekey_organizer.move_selected", text="Down", icon="TRIA_DOWN")
+        op.direction = 'DOWN'
+        op.amount = props.move_amount
         row.operator("shapekey_organizer.move_selected", text="Bottom", icon="TRIA_DOWN_BAR").direction = 'BOTTOM'
+        row.prop(props, 'move_amount', text="")
 
         layout.separator()
 
@@ -2229,7 +4073,10 @@ class SKO_PT_Main(Panel):
             r2.operator("shapekey_organizer.group_select_keys", text="Select Keys", icon='RESTRICT_SELECT_OFF')
             r2.operator("shapekey_organizer.group_filter_apply", text="Filter", icon='FILTER')
             r2.operator("shapekey_organizer.group_filter_clear", text="Clear Filter", icon='X')
-            grp.label(text=f"Active filter: '{props.filter_group or 'None'}'")
+            expr = props.filter_group.strip()
+            fr = grp.row(align=True)
+            fr.alert = bool(expr) and tag_expr(expr) is None and not any(g.name == expr for g in all_groups(context))
+            fr.prop(props, 'filter_group', text="Filter", icon='FILTER')
 
         layout.separator()
 
@@ -2293,6 +4140,7 @@ classes = (
     SKO_GroupItem,
     SKO_Props,
     SKO_AddonPreferences,
+    SKO_OT_ClearTopologyCache,
     SKO_UL_ShapeKeys,
     SKO_UL_Groups,
     SKO_OT_ToggleUseEditMode,
@@ -2316,6 +4164,7 @@ classes = (
     SKO_OT_SetSliderRange,
     SKO_OT_ResetValues,
     SKO_OT_SyncState,
+    SKO_OT_CleanupState,
     SKO_OT_GroupAdd,
     SKO_OT_GroupRemove,
     SKO_OT_GroupMove,
@@ -2330,12 +4179,25 @@ def register():
     for c in classes:
         bpy.utils.register_class(c)
     bpy.types.Scene.shapekey_organizer = bpy.props.PointerProperty(type=SKO_Props)
+    bpy.types.Key.sko_items = CollectionProperty(type=SKO_Item)
+    # Older versions kept all state on the scene; only read to migrate into Key.sko_items.
     bpy.types.Scene.sko_items = CollectionProperty(type=SKO_Item)
     bpy.types.Scene.sko_groups = CollectionProperty(type=SKO_GroupItem)
     bpy.types.Scene.sko_groups_index = IntProperty(default=-1)
 
     if _sko_auto_check not in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.append(_sko_auto_check)
+    for handlers in _SKO_CACHE_HANDLERS:
+        if _sko_invalidate_caches not in handlers:
+            handlers.append(_sko_invalidate_caches)
+    if _sko_on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_sko_on_depsgraph_update)
+    if _sko_on_save_pre not in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.append(_sko_on_save_pre)
+    if _sko_migrate_on_load not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_sko_migrate_on_load)
+    # Enabling the add-on in an open file: migrate once data access is allowed.
+    bpy.app.timers.register(_sko_migrate_on_load, first_interval=0.1)
 
 
 def unregister():
@@ -2344,12 +4206,43 @@ def unregister():
             bpy.app.handlers.load_post.remove(_sko_auto_check)
     except Exception:
         pass
+    for handlers in _SKO_CACHE_HANDLERS:
+        try:
+            if _sko_invalidate_caches in handlers:
+                handlers.remove(_sko_invalidate_caches)
+        except Exception:
+            pass
+    try:
+        if _sko_on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.remove(_sko_on_depsgraph_update)
+    except Exception:
+        pass
+    try:
+        if _sko_on_save_pre in bpy.app.handlers.save_pre:
+            bpy.app.handlers.save_pre.remove(_sko_on_save_pre)
+    except Exception:
+        pass
+    try:
+        if _sko_migrate_on_load in bpy.app.handlers.load_post:
+            bpy.app.handlers.load_post.remove(_sko_migrate_on_load)
+        if bpy.app.timers.is_registered(_sko_migrate_on_load):
+            bpy.app.timers.unregister(_sko_migrate_on_load)
+    except Exception:
+        pass
+    try:
+        if bpy.app.timers.is_registered(_sko_apply_find):
+            bpy.app.timers.unregister(_sko_apply_find)
+    except Exception:
+        pass
+    _FIND_PENDING.clear()
 
     for c in reversed(classes):
         bpy.utils.unregister_class(c)
     del bpy.types.Scene.shapekey_organizer
     if hasattr(bpy.types.Scene, 'sko_items'):
         del bpy.types.Scene.sko_items
+    if hasattr(bpy.types.Key, 'sko_items'):
+        del bpy.types.Key.sko_items
     if hasattr(bpy.types.Scene, 'sko_groups'):
         del bpy.types.Scene.sko_groups
     if hasattr(bpy.types.Scene, 'sko_groups_index'):